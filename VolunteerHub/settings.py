@@ -10,9 +10,12 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import importlib.util
 import os
+from datetime import timedelta
 from pathlib import Path
 import environ
+from corsheaders.defaults import default_headers
 env = environ.Env()
 environ.Env.read_env()
 
@@ -29,7 +32,10 @@ SECRET_KEY = 'django-insecure-vjnv9oz53135367wa+0ma6+_#@-3!nya)npawq-ae&xg&+kgb4
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
 
-ALLOWED_HOSTS = ['localhost',"127.0.0.1", ".vercel.app"]
+# Organisations can be served on their own domain (Organisation.domain);
+# list those domains, comma separated, in TENANT_DOMAINS so Django accepts
+# the Host header before TenantMiddleware resolves it
+ALLOWED_HOSTS = ['localhost',"127.0.0.1", ".vercel.app"] + env.list('TENANT_DOMAINS', default=[])
 
 
 # Application definition
@@ -67,13 +73,51 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_THROTTLE_CLASSES': [
+        'core.throttling.TokenBucketThrottle',
+    ],
+    # Anonymous clients are throttled by IP. Only the hops added by our own
+    # proxies are trusted in X-Forwarded-For (Vercel's edge is one), so a
+    # client can't pick a fresh address per request. 0 means REMOTE_ADDR.
+    'NUM_PROXIES': env.int('NUM_PROXIES', default=1),
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    # Budgets per throttle_scope (see core/views.py), split by anon/user
+    'DEFAULT_THROTTLE_RATES': {
+        'anon': '60/min',
+        'user': '300/min',
+        'volunteer-work.anon': '120/min',
+        'categories.anon': '120/min',
+        'reviews.anon': '60/min',
+        'users': '120/min',
+        'autocomplete': '600/min',
+        'register': '10/hour',
+        'sync': '60/min',
+        'analytics': '60/min',
+        # Scanner devices flush their buffer in batches of up to 500 scans
+        'checkin': '120/min',
+        'leaderboard.anon': '120/min',
+    },
 }
 
-REST_AUTH_REGISTER_SERIALIZERS = {
-    'REGISTER_SERIALIZER': 'core.serializers.CustomRegisterSerializer',
-}
+# MessagePack responses are offered only where msgpack is installed
+if importlib.util.find_spec('msgpack'):
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'].append('core.renderers.MessagePackRenderer')
+
+# Where throttle token buckets live. Set RATE_LIMIT_REDIS_URL to share them
+# between workers; the default keeps them in process memory.
+RATE_LIMIT_STORE = {'BACKEND': 'core.throttling.LocalBucketStore'}
+if env('RATE_LIMIT_REDIS_URL', default=None):
+    RATE_LIMIT_STORE = {
+        'BACKEND': 'core.throttling.RedisBucketStore',
+        'URL': env('RATE_LIMIT_REDIS_URL'),
+    }
 
-REST_AUTH_SERIALIZERS = {
+# dj-rest-auth 3+ reads its settings from REST_AUTH
+REST_AUTH = {
+    'REGISTER_SERIALIZER': 'core.serializers.CustomRegisterSerializer',
     'USER_DETAILS_SERIALIZER': 'core.serializers.CustomUserSerializer',
 }
 
@@ -83,6 +127,7 @@ AUTHENTICATION_BACKENDS = (
 )
 
 CORS_ALLOW_ALL_ORIGINS = True
+CORS_ALLOW_HEADERS = (*default_headers, 'x-organisation')
 
 CSRF_TRUSTED_ORIGINS = [
     "https://volunteer-backend-xi.vercel.app",
@@ -97,6 +142,7 @@ CSRF_TRUSTED_ORIGINS = [
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
+    'core.throttling.RateLimitHeadersMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.security.SecurityMiddleware',
     "whitenoise.middleware.WhiteNoiseMiddleware",
@@ -107,6 +153,8 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'allauth.account.middleware.AccountMiddleware',
+    'core.tenancy.TenantMiddleware',
+    'core.audit.AuditMiddleware',
 ]
 
 ROOT_URLCONF = 'VolunteerHub.urls'
@@ -169,6 +217,17 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+PASSWORD_HASHERS = [
+    'core.hashers.ConfigurablePBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
+# PBKDF2 work factor is Django's default here. bench_signups (and tests)
+# lower it with PASSWORD_HASH_ITERATIONS through override_settings only.
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
@@ -202,4 +261,36 @@ EMAIL_HOST = 'smtp.gmail.com'
 EMAIL_USE_TLS = True
 EMAIL_PORT = 587
 EMAIL_HOST_USER = env("EMAIL")
-EMAIL_HOST_PASSWORD = env("EMAIL_PASSWORD")
\ No newline at end of file
+EMAIL_HOST_PASSWORD = env("EMAIL_PASSWORD")
+
+# Stored responses for retried POSTs carrying an Idempotency-Key header
+IDEMPOTENCY_KEY_TTL = timedelta(hours=24)
+
+# Past volunteer work stays in the hot listings this long, so participants
+# can still find it to leave a review, before archive_past_works moves it out
+ARCHIVE_AFTER = timedelta(days=30)
+
+# Thumbnail proxy (core/images.py). /tmp is the writable disk on Vercel.
+IMAGE_CACHE_DIR = os.path.join('/tmp', 'volunteerhub-thumbnails')
+IMAGE_CACHE_MAX_BYTES = 200 * 1024 * 1024
+IMAGE_FETCH_MAX_BYTES = 10 * 1024 * 1024
+# Decoded size limit; larger images are refused before their pixels are read
+IMAGE_MAX_PIXELS = 40 * 1000 * 1000
+IMAGE_FETCH_TIMEOUT = 5
+# How stale this process's estimate of the cache size may get before a rescan
+IMAGE_CACHE_RESCAN_SECONDS = 300
+
+# /api/sync/ (core/sync.py): change log entries per response, and how long a
+# new entry is held back so a concurrent log write can commit first. Entries
+# are written after the change commits, so this only has to cover the log
+# write itself, not the transaction that made the change
+SYNC_BATCH_SIZE = 500
+SYNC_SETTLE_TIME = timedelta(seconds=2)
+
+# Organisation (tenant) for requests that name none, by X-Organisation header
+# or domain; existing data was moved into it by migration 0026
+DEFAULT_ORGANISATION = env('DEFAULT_ORGANISATION', default='default')
+
+# Check-in QR tokens (core/checkin.py) are verified by signature alone and
+# stop working this long after they were issued
+CHECKIN_TOKEN_MAX_AGE = timedelta(days=30)
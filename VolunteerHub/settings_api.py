@@ -0,0 +1,56 @@
+"""
+Slim settings for API-only serverless deployments.
+
+Select it with DJANGO_SETTINGS_MODULE=VolunteerHub.settings_api. It drops
+the apps and middleware that only serve the admin site and the HTML
+browsable API, so a cold lambda has less to import and set up. allauth and
+allauth.socialaccount stay: dj_rest_auth.registration imports their models
+at module level, and core's register serializer builds on it.
+
+Compare cold starts with:
+    python manage.py startup_profile --settings-module VolunteerHub.settings \
+        --settings-module VolunteerHub.settings_api
+"""
+
+from .settings import *  # noqa: F401,F403
+from .settings import INSTALLED_APPS, MIDDLEWARE, REST_FRAMEWORK
+
+SLIM_EXCLUDED_APPS = [
+    'whitenoise.runserver_nostatic',
+    'django.contrib.admin',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+]
+
+SLIM_EXCLUDED_MIDDLEWARE = [
+    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in SLIM_EXCLUDED_APPS]
+
+# The base list has CommonMiddleware twice; keep the first one only
+MIDDLEWARE = list(dict.fromkeys(mw for mw in MIDDLEWARE if mw not in SLIM_EXCLUDED_MIDDLEWARE))
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+            ],
+        },
+    },
+]
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_RENDERER_CLASSES': [
+        renderer for renderer in REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES']
+        if renderer != 'rest_framework.renderers.BrowsableAPIRenderer'
+    ],
+}
@@ -19,9 +19,12 @@ from django.urls import path,include
 from django.conf import settings
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
     path('api/',include('core.urls')),
     path('api-auth/', include('rest_framework.urls')),
     path('api/auth/', include("dj_rest_auth.urls")),
     path('api/auth/registration/', include("dj_rest_auth.registration.urls")),
-]
\ No newline at end of file
+]
+
+# The slim API profile (VolunteerHub.settings_api) ships without the admin
+if 'django.contrib.admin' in settings.INSTALLED_APPS:
+    urlpatterns.insert(0, path('admin/', admin.site.urls))
@@ -1,13 +1,148 @@
-from django.contrib import admin
+from collections import defaultdict
+
+from django.contrib import admin, messages
+from django.db import transaction
+from django.utils import timezone
+
 from . import models
+from .pagination import EstimatedCountPaginator
 
 # Register your models here.
 
-admin.site.register(models.Profile)
-admin.site.register(models.Review)
-admin.site.register(models.VolunteerWork)
-admin.site.register(models.JoinRequest)
+class TenantAdmin(admin.ModelAdmin):
+    """
+    Staff work across organisations, so the admin reads tenant models through
+    ``all_tenants`` (the default manager is scoped to the request's
+    organisation) and adds an organisation filter instead.
+    """
+
+    def get_queryset(self, request):
+        queryset = getattr(self.model, 'all_tenants', self.model._default_manager).get_queryset()
+        ordering = self.get_ordering(request)
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+        return queryset
+
+    def get_list_filter(self, request):
+        list_filter = super().get_list_filter(request)
+        if hasattr(self.model, 'all_tenants'):
+            return (self.model.objects.organisation, *list_filter)
+        return list_filter
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        related = db_field.remote_field.model
+        if 'queryset' not in kwargs and hasattr(related, 'all_tenants'):
+            kwargs['queryset'] = related.all_tenants.all()
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+    def formfield_for_manytomany(self, db_field, request, **kwargs):
+        related = db_field.remote_field.model
+        if 'queryset' not in kwargs and hasattr(related, 'all_tenants'):
+            kwargs['queryset'] = related.all_tenants.all()
+        return super().formfield_for_manytomany(db_field, request, **kwargs)
+
+
+# The big tables share these: __str__ of reviews and join requests reaches
+# into the work and the user, so their changelists join both up front, FK
+# fields use autocomplete instead of a <select> of every row, and page
+# counts come from the planner estimate (unfiltered lists carry no tenant
+# predicate, see TenantAdmin).
+
+class LargeTableAdmin(TenantAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_per_page = 50
+
+
+@admin.register(models.Organisation)
+class OrganisationAdmin(admin.ModelAdmin):
+    list_display = ('name', 'slug', 'domain')
+    search_fields = ('name', 'slug', 'domain')
+    prepopulated_fields = {'slug': ('name',)}
+    autocomplete_fields = ('members',)
+
+
+@admin.register(models.Profile)
+class ProfileAdmin(LargeTableAdmin):
+    list_display = ('user', 'contact_info', 'updated_at')
+    list_select_related = ('user',)
+    search_fields = ('user__username',)
+    autocomplete_fields = ('user',)
+
+
+@admin.register(models.VolunteerWork)
+class VolunteerWorkAdmin(LargeTableAdmin):
+    list_display = ('title', 'date', 'organizer', 'category', 'archived')
+    list_select_related = ('organizer', 'category')
+    list_filter = ('archived', 'category', ('date', admin.DateFieldListFilter))
+    search_fields = ('title',)
+    ordering = ('-date',)
+    autocomplete_fields = ('organizer', 'participants', 'category')
+    raw_id_fields = ('series',)
+    # Maintained by signals and archive_past_works
+    readonly_fields = ('updated_at', *models.RATING_COUNT_FIELDS.values())
+
+
+@admin.register(models.Review)
+class ReviewAdmin(LargeTableAdmin):
+    list_display = ('__str__', 'rating', 'created_at')
+    list_select_related = ('volunteer_work', 'user')
+    autocomplete_fields = ('volunteer_work', 'user')
+    ordering = ('-pk',)
+
+
+@admin.register(models.JoinRequest)
+class JoinRequestAdmin(LargeTableAdmin):
+    list_display = ('user', 'volunteer_work', 'status', 'created_at', 'decided_at')
+    list_select_related = ('user', 'volunteer_work')
+    list_filter = ('status', 'archived')
+    ordering = ('-created_at',)
+    autocomplete_fields = ('volunteer_work', 'user')
+    actions = ('approve_selected', 'reject_selected')
+
+    def decide(self, request, queryset, status):
+        """
+        Same effect as the API's approve/reject for every pending request
+        selected: per-row saves keep the audit trail, sync log and analytics
+        cache in step, and approved users are added with one participants
+        add per work, which bumps the work's updated_at.
+        """
+        now = timezone.now()
+        joined = defaultdict(list)
+        with transaction.atomic():
+            pending = queryset.filter(status='pending').select_related('user', 'volunteer_work').select_for_update(of=('self',))
+            for join_request in pending:
+                join_request.status = status
+                join_request.decided_at = now
+                join_request.save(update_fields=['status', 'decided_at'])
+                joined[join_request.volunteer_work].append(join_request.user)
+            if status == 'approved':
+                for work, users in joined.items():
+                    work.participants.add(*users)
+        decided = sum(len(users) for users in joined.values())
+        skipped = queryset.count() - decided
+        self.message_user(request, f"{decided} join request(s) {status}.", messages.SUCCESS)
+        if skipped:
+            self.message_user(request, f"{skipped} already decided request(s) left unchanged.", messages.WARNING)
+
+    @admin.action(description="Approve selected pending join requests")
+    def approve_selected(self, request, queryset):
+        self.decide(request, queryset, 'approved')
+
+    @admin.action(description="Reject selected pending join requests")
+    def reject_selected(self, request, queryset):
+        self.decide(request, queryset, 'rejected')
+
+
+@admin.register(models.Attendance)
+class AttendanceAdmin(LargeTableAdmin):
+    list_display = ('user', 'volunteer_work', 'checked_in_at', 'checked_out_at')
+    list_select_related = ('user', 'volunteer_work')
+    ordering = ('-pk',)
+    autocomplete_fields = ('volunteer_work', 'user', 'scanned_by')
+
 
-class CategoryAdmin(admin.ModelAdmin):
+class CategoryAdmin(TenantAdmin):
     prepopulated_fields = {'slug':('name',),}
-admin.site.register(models.Category,CategoryAdmin)
\ No newline at end of file
+    search_fields = ('name',)
+admin.site.register(models.Category,CategoryAdmin)
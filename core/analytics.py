@@ -0,0 +1,210 @@
+"""
+Organizer analytics: join-request funnel, approval latency, participant
+retention and rating trend, per event and per month, for everything one
+organizer has run. Each figure is a grouped aggregate in SQL (a handful of
+queries however many events there are); the finished report is cached per
+organizer and organisation, and dropped by the signal receivers below when
+anything it counts changes.
+"""
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.db.models import Avg, Count, F, Q, Window
+from django.db.models.functions import Lag, TruncMonth
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .models import RATING_COUNT_FIELDS, JoinRequest, Review, VolunteerWork
+from .tenancy import tenant_cache_key
+
+CACHE_TIMEOUT = 10 * 60
+STATUSES = ('pending', 'approved', 'rejected')
+
+
+def cache_key(organizer_id, organisation_id):
+    return tenant_cache_key(f'analytics:{organizer_id}', organisation_id)
+
+
+def hours(duration):
+    return round(duration.total_seconds() / 3600, 2) if duration is not None else None
+
+
+def month_label(moment):
+    return moment.strftime('%Y-%m')
+
+
+def funnel_counts():
+    counts = {status: Count('pk', filter=Q(status=status)) for status in STATUSES}
+    counts['latency'] = Avg(F('decided_at') - F('created_at'), filter=Q(status='approved', decided_at__isnull=False))
+    return counts
+
+
+def organizer_works(organizer_id, organisation_id):
+    return VolunteerWork.all_tenants.filter(organizer_id=organizer_id, organisation_id=organisation_id)
+
+
+def event_rows(works):
+    requests = {
+        row.pop('volunteer_work_id'): row
+        for row in JoinRequest.all_tenants.filter(volunteer_work__in=works)
+        .values('volunteer_work_id').annotate(**funnel_counts()).order_by()
+    }
+    through = VolunteerWork.participants.through
+    participants = dict(
+        through.objects.filter(volunteerwork__in=works)
+        .values('volunteerwork_id').annotate(n=Count('user_id')).order_by()
+        .values_list('volunteerwork_id', 'n')
+    )
+
+    rows = []
+    for work in works.order_by('-date').only('id', 'title', 'date', *RATING_COUNT_FIELDS.values()):
+        funnel = requests.get(work.pk, {})
+        histogram = work.rating_histogram()
+        rows.append({
+            'id': work.pk,
+            'title': work.title,
+            'date': work.date,
+            'requests': {status: funnel.get(status, 0) for status in STATUSES},
+            'approval_latency_hours': hours(funnel.get('latency')),
+            'participants': participants.get(work.pk, 0),
+            'reviews': sum(histogram.values()),
+            'average_rating': work.average_rating(),
+        })
+    return rows
+
+
+def month_rows(works):
+    months = defaultdict(lambda: {
+        'requests': {status: 0 for status in STATUSES},
+        'approval_latency_hours': None,
+        'participants': 0,
+        'new_participants': 0,
+        'returning_participants': 0,
+        'reviews': 0,
+        'average_rating': None,
+        'rating_change': None,
+    })
+
+    for row in (
+        JoinRequest.all_tenants.filter(volunteer_work__in=works)
+        .annotate(month=TruncMonth('created_at')).values('month')
+        .annotate(**funnel_counts()).order_by('month')
+    ):
+        month = months[month_label(row['month'])]
+        month['requests'] = {status: row[status] for status in STATUSES}
+        month['approval_latency_hours'] = hours(row['latency'])
+
+    # Month over month change comes from LAG over the grouped averages
+    for row in (
+        Review.all_tenants.filter(volunteer_work__in=works)
+        .annotate(month=TruncMonth('created_at')).values('month')
+        .annotate(reviews=Count('pk'), average=Avg('rating'))
+        .annotate(previous=Window(Lag('average'), order_by=F('month').asc()))
+        .order_by('month')
+    ):
+        month = months[month_label(row['month'])]
+        month['reviews'] = row['reviews']
+        month['average_rating'] = round(row['average'], 2)
+        if row['previous'] is not None:
+            month['rating_change'] = round(row['average'] - row['previous'], 2)
+
+    # Retention: one (participant, month) pair per month they took part in.
+    # A participant is new in their first month with this organizer and
+    # returning in every later one.
+    through = VolunteerWork.participants.through
+    seen = set()
+    for user_id, moment in (
+        through.objects.filter(volunteerwork__in=works)
+        .annotate(month=TruncMonth('volunteerwork__date')).values_list('user_id', 'month')
+        .distinct().order_by('month')
+    ):
+        month = months[month_label(moment)]
+        month['participants'] += 1
+        if user_id in seen:
+            month['returning_participants'] += 1
+        else:
+            month['new_participants'] += 1
+            seen.add(user_id)
+
+    return [{'month': label, **months[label]} for label in sorted(months)]
+
+
+def totals(works, events):
+    funnel = (
+        JoinRequest.all_tenants.filter(volunteer_work__in=works)
+        .aggregate(**funnel_counts())
+    )
+    through = VolunteerWork.participants.through
+    per_user = (
+        through.objects.filter(volunteerwork__in=works)
+        .values('user_id').annotate(n=Count('volunteerwork_id')).order_by()
+    )
+    reviews = sum(event['reviews'] for event in events)
+    return {
+        'events': len(events),
+        'requests': {status: funnel[status] for status in STATUSES},
+        'approval_latency_hours': hours(funnel['latency']),
+        'participants': per_user.count(),
+        'returning_participants': per_user.filter(n__gte=2).count(),
+        'reviews': reviews,
+        'average_rating': round(
+            sum(event['average_rating'] * event['reviews'] for event in events) / reviews, 2
+        ) if reviews else 0,
+    }
+
+
+def organizer_report(organizer_id, organisation_id):
+    """Report on the works ``organizer_id`` runs for one organisation."""
+    key = cache_key(organizer_id, organisation_id)
+    report = cache.get(key)
+    if report is None:
+        works = organizer_works(organizer_id, organisation_id)
+        events = event_rows(works)
+        report = {
+            'totals': totals(works, events),
+            'months': month_rows(works),
+            'events': events,
+        }
+        cache.set(key, report, CACHE_TIMEOUT)
+    return report
+
+
+def invalidate(*works):
+    """Drop the reports covering ``works``, given as (organizer_id, organisation_id) pairs."""
+    cache.delete_many([cache_key(*work) for work in set(works) if None not in work])
+
+
+def owners(**filters):
+    return VolunteerWork.all_tenants.filter(**filters).values_list('organizer_id', 'organisation_id').distinct()
+
+
+@receiver(post_save, sender=VolunteerWork)
+@receiver(post_delete, sender=VolunteerWork)
+def invalidate_for_work(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate((instance.organizer_id, instance.organisation_id))
+
+
+@receiver(post_save, sender=JoinRequest)
+@receiver(post_delete, sender=JoinRequest)
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_for_work_child(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    field = sender._meta.get_field('volunteer_work')
+    if field.is_cached(instance):
+        invalidate((instance.volunteer_work.organizer_id, instance.volunteer_work.organisation_id))
+    else:
+        invalidate(*owners(pk=instance.volunteer_work_id))
+
+
+@receiver(m2m_changed, sender=VolunteerWork.participants.through)
+def invalidate_for_participants(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            invalidate((instance.organizer_id, instance.organisation_id))
+    elif action in ('post_add', 'post_remove') and pk_set:
+        invalidate(*owners(pk__in=pk_set))
+    elif action == 'pre_clear':
+        invalidate(*owners(participants=instance))
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from . import audit  # noqa: F401 -- connects the audit signal receivers
+        from . import sync  # noqa: F401 -- connects the change log receivers
+        from . import analytics  # noqa: F401 -- connects the report cache invalidation
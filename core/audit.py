@@ -0,0 +1,91 @@
+import logging
+from contextvars import ContextVar
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from .models import AuditEvent, JoinRequest, Review, VolunteerWork
+
+logger = logging.getLogger(__name__)
+
+AUDITED_MODELS = (VolunteerWork, JoinRequest, Review)
+
+# Events committed during the current request, flushed by AuditMiddleware
+_pending = ContextVar('audit_pending', default=None)
+
+
+def snapshot(instance, update_fields=None):
+    fields = [f for f in instance._meta.concrete_fields if not f.primary_key]
+    if update_fields:
+        fields = [f for f in fields if f.name in update_fields]
+    return {f.attname: f.value_from_object(instance) for f in fields}
+
+
+def record(instance, action, changes=None, actor=None):
+    """
+    Queue an audit event for ``instance``. It only becomes pending once the
+    surrounding transaction commits, so rolled-back changes leave no trace.
+    Inside a request all events are written by one bulk insert at the end;
+    elsewhere (shell, management commands) each is saved on commit.
+    """
+    event = AuditEvent(
+        occurred_at=timezone.now(),
+        actor=actor,
+        action=action,
+        object_type=instance._meta.model_name,
+        object_id=instance.pk,
+        changes=changes or {},
+    )
+    pending = _pending.get()
+    if pending is None:
+        transaction.on_commit(event.save)
+    else:
+        transaction.on_commit(lambda: pending.append(event))
+
+
+def flush(events, user=None):
+    if not events:
+        return
+    if user is not None and user.is_authenticated:
+        for event in events:
+            if event.actor_id is None:
+                event.actor = user
+    try:
+        AuditEvent.objects.bulk_create(events)
+    except Exception:
+        # The audited changes are already committed; don't fail the response
+        logger.exception("Could not write %d audit events", len(events))
+
+
+class AuditMiddleware:
+    """Collects the request's audit events and writes them in a single batch."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        events = []
+        token = _pending.set(events)
+        try:
+            return self.get_response(request)
+        finally:
+            _pending.reset(token)
+            # DRF copies the authenticated user back onto the Django request
+            flush(events, getattr(request, 'user', None))
+
+
+def audit_save(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    if not raw:
+        record(instance, 'create' if created else 'update', snapshot(instance, update_fields))
+
+
+def audit_delete(sender, instance, **kwargs):
+    record(instance, 'delete')
+
+
+# Per sender: a post_delete receiver without one would make every model's
+# delete() fetch and signal row by row instead of issuing a single DELETE
+for model in AUDITED_MODELS:
+    post_save.connect(audit_save, sender=model)
+    post_delete.connect(audit_delete, sender=model)
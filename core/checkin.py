@@ -0,0 +1,121 @@
+"""
+Door check-in for volunteer work. A participant's QR code carries a signed
+token naming the work and the user; the signature (HMAC over SECRET_KEY) is
+all a scan needs to be trusted, so validating one never touches the database.
+Scanner devices buffer scans while offline and post them in batches; each
+batch becomes one INSERT ... ON CONFLICT that keeps the earliest check-in and
+the latest check-out seen, so batches can be replayed, arrive out of order,
+or come from two devices scanning the same person.
+"""
+from django.conf import settings
+from django.core import signing
+from django.db import connection
+from django.db.models import DurationField, ExpressionWrapper, F, Sum
+from django.db.models.functions import Coalesce
+
+from .models import Attendance
+
+SALT = 'core.checkin'
+
+
+def make_token(work_id, user_id):
+    return signing.dumps([work_id, user_id], salt=SALT)
+
+
+def read_token(token, work_id):
+    """
+    The user id in ``token`` if it was signed by us for ``work_id`` and has
+    not expired, else raises ``signing.BadSignature``.
+    """
+    max_age = getattr(settings, 'CHECKIN_TOKEN_MAX_AGE', None)
+    try:
+        token_work_id, user_id = signing.loads(token, salt=SALT, max_age=max_age)
+    except signing.SignatureExpired:
+        raise signing.SignatureExpired('Check-in token has expired.')
+    except (signing.BadSignature, TypeError, ValueError):
+        raise signing.BadSignature('Invalid check-in token.')
+    if token_work_id != work_id:
+        raise signing.BadSignature('Check-in token is for another volunteer work.')
+    return user_id
+
+
+def record_scans(work, scans, scanned_by):
+    """
+    Upsert validated ``scans`` (dicts of token, scanned_at and kind) for
+    ``work``. Returns (accepted, rejected), the latter as (index, reason)
+    pairs for scans whose token did not verify.
+    """
+    check_ins, check_outs, rejected = {}, {}, []
+    for index, scan in enumerate(scans):
+        try:
+            user_id = read_token(scan['token'], work.pk)
+        except signing.BadSignature as e:
+            rejected.append((index, str(e)))
+            continue
+        # Within a batch the earliest check-in and the latest check-out count
+        if scan['kind'] == 'in':
+            if user_id not in check_ins or scan['scanned_at'] < check_ins[user_id]:
+                check_ins[user_id] = scan['scanned_at']
+        elif user_id not in check_outs or scan['scanned_at'] > check_outs[user_id]:
+            check_outs[user_id] = scan['scanned_at']
+
+    merge_scans(work, scanned_by, {
+        user_id: (check_ins.get(user_id), check_outs.get(user_id))
+        for user_id in check_ins.keys() | check_outs.keys()
+    })
+    return len(scans) - len(rejected), rejected
+
+
+def merge_scans(work, scanned_by, times):
+    """
+    Upsert ``times`` ({user_id: (checked_in_at, checked_out_at)}, either may
+    be None) into Attendance for ``work``. Existing rows keep the earlier
+    check-in and the later check-out, which the ORM's bulk_create can't
+    express, hence the SQL.
+    """
+    if not times:
+        return
+    # LEAST/GREATEST skip NULLs on Postgres; SQLite's MIN/MAX return NULL
+    # instead, which the COALESCE falls through
+    least, greatest = ('LEAST', 'GREATEST') if connection.vendor == 'postgresql' else ('MIN', 'MAX')
+    opts = Attendance._meta
+    table = connection.ops.quote_name(opts.db_table)
+    columns = [opts.get_field(name).column for name in (
+        'organisation', 'volunteer_work', 'user', 'scanned_by', 'checked_in_at', 'checked_out_at',
+    )]
+    organisation, work_column, user, _, checked_in, checked_out = map(connection.ops.quote_name, columns)
+
+    def merged(column, pick):
+        existing, excluded = f'{table}.{column}', f'EXCLUDED.{column}'
+        return f'{column} = COALESCE({pick}({existing}, {excluded}), {existing}, {excluded})'
+
+    moment = connection.ops.adapt_datetimefield_value
+    params = []
+    for user_id, (checked_in_at, checked_out_at) in times.items():
+        params += [work.organisation_id, work.pk, user_id, scanned_by.pk, moment(checked_in_at), moment(checked_out_at)]
+    placeholders = ', '.join(['(%s, %s, %s, %s, %s, %s)'] * len(times))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} ({', '.join(map(connection.ops.quote_name, columns))}) VALUES {placeholders} "
+            f"ON CONFLICT ({work_column}, {user}) DO UPDATE SET "
+            f"{merged(checked_in, least)}, {merged(checked_out, greatest)}",
+            params,
+        )
+
+
+def attended_time():
+    """Time at a work: door to door, or the work's planned duration when nobody scanned out."""
+    return Coalesce(
+        ExpressionWrapper(F('checked_out_at') - F('checked_in_at'), output_field=DurationField()),
+        F('volunteer_work__duration'),
+    )
+
+
+def hours_by_user(**filters):
+    """{user_id: hours attended} over the Attendance rows matching ``filters``."""
+    rows = (
+        Attendance.objects.filter(**filters)
+        .values('user_id').annotate(total=Sum(attended_time())).order_by()
+        .values_list('user_id', 'total')
+    )
+    return {user_id: round(total.total_seconds() / 3600, 2) if total else 0 for user_id, total in rows}
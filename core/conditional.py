@@ -0,0 +1,76 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+def make_etag(request, *parts):
+    """
+    Strong ETag for the representation built from ``parts``.
+
+    The negotiated media type is mixed in so the browsable API and the JSON
+    rendering of the same resource never share a validator.
+    """
+    media_type = getattr(request, 'accepted_media_type', '') or ''
+    raw = '|'.join([request.get_full_path(), media_type] + [str(part) for part in parts])
+    return '"%s"' % hashlib.md5(raw.encode()).hexdigest()
+
+
+def queryset_validators(queryset, field='updated_at'):
+    """
+    Return ``(etag_parts, last_modified)`` for a queryset using a single
+    aggregate query, or ``(None, None)`` when there is nothing to validate.
+    """
+    aggregate = queryset.order_by().aggregate(last_modified=Max(field), count=Count('pk'))
+    last_modified = aggregate['last_modified']
+    if last_modified is None:
+        return None, None
+    return (aggregate['count'], last_modified.isoformat()), last_modified
+
+
+def conditional_response(request, etag_parts, last_modified, render):
+    """
+    Answer a conditional GET with 304 when the client's validators still match,
+    otherwise call ``render`` and stamp the ETag / Last-Modified headers on it.
+    """
+    if etag_parts is None:
+        return render()
+
+    etag = make_etag(request, *etag_parts)
+    timestamp = int(last_modified.timestamp())
+    response = get_conditional_response(request._request, etag=etag, last_modified=timestamp)
+    if response is None:
+        response = render()
+    if response.status_code in (200, 304):
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(timestamp)
+    return response
+
+
+class ConditionalGetMixin:
+    """
+    Adds ETag / Last-Modified handling to ``list`` and ``retrieve`` of a
+    ``ModelViewSet`` whose model has an ``updated_at`` column.
+    """
+    conditional_field = 'updated_at'
+
+    def get_object_queryset(self):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset())
+        return queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        etag_parts, last_modified = queryset_validators(queryset, self.conditional_field)
+        return conditional_response(
+            request, etag_parts, last_modified,
+            lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        etag_parts, last_modified = queryset_validators(self.get_object_queryset(), self.conditional_field)
+        return conditional_response(
+            request, etag_parts, last_modified,
+            lambda: super(ConditionalGetMixin, self).retrieve(request, *args, **kwargs),
+        )
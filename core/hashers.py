@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class ConfigurablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    Django's PBKDF2 hasher with the work factor taken from
+    PASSWORD_HASH_ITERATIONS, so load tests can make signups cheap. It keeps
+    the ``pbkdf2_sha256`` algorithm name, so existing hashes still verify.
+    Logins only ever re-hash upwards: a low setting can't weaken stored
+    passwords, and hashes made under one get upgraded once it's gone.
+    """
+
+    @property
+    def iterations(self):
+        return getattr(settings, 'PASSWORD_HASH_ITERATIONS', None) or PBKDF2PasswordHasher.iterations
+
+    def must_update(self, encoded):
+        decoded = self.decode(encoded)
+        return decoded['iterations'] < max(self.iterations, PBKDF2PasswordHasher.iterations)
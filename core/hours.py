@@ -0,0 +1,168 @@
+"""
+Volunteer hours. When a work is over, complete_works credits everyone who
+took part to the append-only HoursLedgerEntry table and bumps their
+VolunteerHours total in the same transaction, so a user's total is a single
+row read. Leaderboards (global and per category, all time, per year and per
+month) live precomputed in LeaderboardEntry; refresh_leaderboards folds in
+only the ledger rows added since its last run, re-summing just those users
+and re-ranking just the part of each board their move could have shifted.
+"""
+import logging
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import DateTimeField, ExpressionWrapper, F, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .checkin import hours_by_user
+from .models import Attendance, HoursLedgerEntry, LeaderboardEntry, VolunteerHours, VolunteerWork
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_BOARD = 'all'
+ALL_TIME = ''
+
+
+def category_board(category_id):
+    return f'category-{category_id}'
+
+
+def due_works(now=None):
+    """Uncompleted works whose planned end (date plus duration) has passed."""
+    ends_at = ExpressionWrapper(F('date') + Coalesce('duration', Value(timedelta(0))), output_field=DateTimeField())
+    return (
+        VolunteerWork.all_tenants.filter(completed_at__isnull=True)
+        .alias(ends_at=ends_at).filter(ends_at__lt=now or timezone.now())
+    )
+
+
+def work_hours(work):
+    """
+    {user_id: Decimal hours} to credit for ``work``: attended time where
+    anyone was checked in, else the planned duration for every participant.
+    """
+    if Attendance.all_tenants.filter(volunteer_work=work).exists():
+        attended = hours_by_user(volunteer_work=work)
+        # Clock skew between two scanners can put the check-out first
+        skewed = sorted(user_id for user_id, hours in attended.items() if hours < 0)
+        if skewed:
+            logger.warning("Work %s: check-out before check-in for users %s, not credited", work.pk, skewed)
+        return {user_id: Decimal(str(hours)) for user_id, hours in attended.items() if hours > 0}
+    if not work.duration:
+        return {}
+    hours = Decimal(work.duration.total_seconds() / 3600).quantize(Decimal('0.01'))
+    return {user_id: hours for user_id in work.participants.values_list('pk', flat=True)}
+
+
+def add_to_totals(organisation_id, hours, now=None):
+    now = now or timezone.now()
+    VolunteerHours.all_tenants.bulk_create(
+        [VolunteerHours(organisation_id=organisation_id, user_id=user_id) for user_id in hours],
+        ignore_conflicts=True,
+    )
+    # Participants of one work mostly get the same amount: one UPDATE each
+    by_amount = defaultdict(list)
+    for user_id, amount in hours.items():
+        by_amount[amount].append(user_id)
+    for amount, user_ids in by_amount.items():
+        VolunteerHours.all_tenants.filter(organisation_id=organisation_id, user_id__in=user_ids).update(
+            hours=F('hours') + amount, updated_at=now,
+        )
+
+
+def complete_work(work, now=None):
+    """Credit the hours for ``work`` once. Returns the number of ledger rows written."""
+    now = now or timezone.now()
+    with transaction.atomic():
+        # Claiming the work first makes a second run (or a concurrent one) a no-op
+        if not VolunteerWork.all_tenants.filter(pk=work.pk, completed_at__isnull=True).update(completed_at=now):
+            return 0
+        hours = work_hours(work)
+        HoursLedgerEntry.all_tenants.bulk_create([
+            HoursLedgerEntry(
+                organisation_id=work.organisation_id, user_id=user_id, volunteer_work_id=work.pk,
+                category_id=work.category_id, worked_at=work.date, hours=amount,
+            )
+            for user_id, amount in hours.items()
+        ])
+        add_to_totals(work.organisation_id, hours, now)
+    return len(hours)
+
+
+def boards_for(category_id, worked_at):
+    """The (board, period) pairs a ledger row counts towards."""
+    local = timezone.localtime(worked_at)
+    periods = (ALL_TIME, f'{local:%Y}', f'{local:%Y-%m}')
+    boards = [GLOBAL_BOARD] if category_id is None else [GLOBAL_BOARD, category_board(category_id)]
+    return [(board, period) for board in boards for period in periods]
+
+
+def ledger_for(organisation_id, board, period):
+    ledger = HoursLedgerEntry.all_tenants.filter(organisation_id=organisation_id)
+    if board != GLOBAL_BOARD:
+        ledger = ledger.filter(category_id=int(board.removeprefix('category-')))
+    if period:
+        year, _, month = period.partition('-')
+        ledger = ledger.filter(worked_at__year=int(year))
+        if month:
+            ledger = ledger.filter(worked_at__month=int(month))
+    return ledger
+
+
+def rerank(organisation_id, board, period, user_ids):
+    """
+    Re-sum ``user_ids`` on one board and fix the ranks their change moved.
+    Ranks are 1 + the number of users with strictly more hours, so only rows
+    with hours between a changed user's old and new total can move.
+    """
+    rows = LeaderboardEntry.all_tenants.filter(organisation_id=organisation_id, board=board, period=period)
+    old = dict(rows.filter(user_id__in=user_ids).values_list('user_id', 'hours'))
+    new = dict(
+        ledger_for(organisation_id, board, period).filter(user_id__in=user_ids)
+        .values('user_id').annotate(total=Sum('hours')).order_by()
+        .values_list('user_id', 'total')
+    )
+    LeaderboardEntry.all_tenants.bulk_create(
+        [
+            LeaderboardEntry(organisation_id=organisation_id, board=board, period=period, user_id=user_id, hours=hours)
+            for user_id, hours in new.items()
+        ],
+        update_conflicts=True,
+        unique_fields=['organisation', 'board', 'period', 'user'],
+        update_fields=['hours'],
+    )
+
+    moves = [(old.get(user_id, 0), new.get(user_id, 0)) for user_id in user_ids]
+    low = min(min(move) for move in moves)
+    high = max(max(move) for move in moves)
+    rank = rows.filter(hours__gt=high).count() + 1
+    changed, previous, position = [], None, rank
+    for entry in rows.filter(hours__gte=low, hours__lte=high).order_by('-hours', 'user_id').only('pk', 'hours', 'rank'):
+        if entry.hours != previous:
+            rank, previous = position, entry.hours
+        if entry.rank != rank:
+            entry.rank = rank
+            changed.append(entry)
+        position += 1
+    LeaderboardEntry.all_tenants.bulk_update(changed, ['rank'], batch_size=500)
+    return len(changed)
+
+
+def refresh_leaderboards():
+    """Fold unranked ledger rows into the boards they touch. Returns (rows, boards)."""
+    with transaction.atomic():
+        pending = list(
+            HoursLedgerEntry.all_tenants.filter(ranked=False).select_for_update(skip_locked=True)
+            .values_list('pk', 'organisation_id', 'user_id', 'category_id', 'worked_at')
+        )
+        changed = defaultdict(set)
+        for pk, organisation_id, user_id, category_id, worked_at in pending:
+            for board, period in boards_for(category_id, worked_at):
+                changed[organisation_id, board, period].add(user_id)
+        for (organisation_id, board, period), user_ids in changed.items():
+            rerank(organisation_id, board, period, user_ids)
+        HoursLedgerEntry.all_tenants.filter(pk__in=[row[0] for row in pending]).update(ranked=True)
+    return len(pending), len(changed)
@@ -0,0 +1,100 @@
+import json
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.crypto import salted_hmac
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.throttling import BaseThrottle
+
+from .models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+
+
+def get_ttl():
+    return getattr(settings, 'IDEMPOTENCY_KEY_TTL', timedelta(hours=24))
+
+
+def request_scope(request):
+    if request.user and request.user.is_authenticated:
+        return f'user:{request.user.pk}'
+    # Anonymous keys are per client address (trusting the same proxies as
+    # the throttle), so two clients picking the same key don't collide
+    return f'anon:{BaseThrottle().get_ident(request)}'[:64]
+
+
+def request_fingerprint(request):
+    """
+    Keyed hash of the request. Bodies carry passwords (/register/), so a
+    plain digest stored in the table could be brute-forced offline.
+    """
+    data = request.data
+    if hasattr(data, 'lists'):
+        data = dict(data.lists())
+    payload = json.dumps([request.method, request.path, data], sort_keys=True, default=str)
+    return salted_hmac('core.idempotency', payload, algorithm='sha256').hexdigest()
+
+
+def replay(record, fingerprint):
+    if record.request_fingerprint != fingerprint:
+        return Response(
+            {"detail": "This Idempotency-Key was already used with a different request."},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    if record.status_code is None:
+        return Response(
+            {"detail": "A request with this Idempotency-Key is still being processed."},
+            status=status.HTTP_409_CONFLICT,
+        )
+    return Response(record.response_body, status=record.status_code, headers={REPLAYED_HEADER: 'true'})
+
+
+def idempotent(view_method):
+    """
+    Make a DRF handler safe to retry when the client sends an Idempotency-Key.
+
+    The key row is inserted in the same transaction the handler runs in. On
+    Postgres a concurrent duplicate blocks on the unique index until the first
+    request commits and then replays its stored response, so the handler runs
+    once per key. Requests without the header are passed straight through.
+    """
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return view_method(self, request, *args, **kwargs)
+        if len(key) > 255:
+            return Response({"detail": "Idempotency-Key is too long."}, status=status.HTTP_400_BAD_REQUEST)
+
+        fingerprint = request_fingerprint(request)
+        with transaction.atomic():
+            record, created = IdempotencyKey.objects.get_or_create(
+                scope=request_scope(request), key=key,
+                defaults={'request_fingerprint': fingerprint},
+            )
+            if not created:
+                if record.created_at >= timezone.now() - get_ttl():
+                    return replay(record, fingerprint)
+                # Expired but not purged yet: start over with this request
+                record.request_fingerprint = fingerprint
+                record.status_code = None
+                record.response_body = None
+                record.created_at = timezone.now()
+
+            response = view_method(self, request, *args, **kwargs)
+            if response.status_code >= 500:
+                # Let the client retry for real instead of replaying a failure
+                transaction.set_rollback(True)
+                return response
+
+            record.status_code = response.status_code
+            record.response_body = response.data
+            record.save()
+        return response
+
+    return wrapper
@@ -0,0 +1,262 @@
+"""
+Thumbnail proxy for the external image URLs users store on works and
+profiles: fetch the original once, shrink it to WebP, keep it in a
+size-capped disk cache.
+
+Pillow and requests are imported where they are used so that read-only
+API lambdas don't pay for them at cold start.
+"""
+import hashlib
+import ipaddress
+import os
+import socket
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from io import BytesIO
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import ImageLink
+
+THUMBNAIL_SIZES = (64, 128, 256, 512)
+MAX_REDIRECTS = 3
+
+
+class ImageFetchError(Exception):
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def setting(name, default):
+    return getattr(settings, name, default)
+
+
+class ThumbnailCache:
+    """
+    Files under IMAGE_CACHE_DIR named by a hash of (url, size). A hit bumps
+    the file's mtime, and writes evict the least recently used files once
+    the directory grows past IMAGE_CACHE_MAX_BYTES. The directory size is
+    tracked in memory per process, so writes only walk the directory when
+    the cap is reached or the estimate is IMAGE_CACHE_RESCAN_SECONDS old
+    (other processes may share the directory).
+    """
+    _usage = {}  # root -> [bytes, monotonic time of the last walk]
+    _lock = threading.Lock()
+
+    def __init__(self, root=None, max_bytes=None):
+        self.root = root or setting('IMAGE_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'volunteerhub-thumbnails'))
+        self.max_bytes = max_bytes or setting('IMAGE_CACHE_MAX_BYTES', 200 * 1024 * 1024)
+
+    @staticmethod
+    def digest(url, size):
+        return hashlib.sha256(f'{size}:{url}'.encode()).hexdigest()
+
+    def path(self, url, size):
+        digest = self.digest(url, size)
+        return os.path.join(self.root, digest[:2], f'{digest}.webp')
+
+    def get(self, url, size):
+        path = self.path(url, size)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, url, size, data):
+        path = self.path(url, size)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            replaced = os.path.getsize(path)
+        except FileNotFoundError:
+            replaced = 0
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+        self.record_write(len(data) - replaced)
+        return path
+
+    def record_write(self, delta):
+        rescan = setting('IMAGE_CACHE_RESCAN_SECONDS', 300)
+        with self._lock:
+            usage = self._usage.get(self.root)
+            if usage is not None:
+                usage[0] += delta
+            if usage is None or usage[0] > self.max_bytes or time.monotonic() - usage[1] > rescan:
+                self._usage[self.root] = [self.evict(), time.monotonic()]
+
+    def evict(self):
+        """Walk the cache, trim it if it is over the cap, and return its size."""
+        files = []
+        for directory, _, names in os.walk(self.root):
+            for name in names:
+                full = os.path.join(directory, name)
+                try:
+                    stat = os.stat(full)
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, full))
+        total = sum(size for _, size, _ in files)
+        if total <= self.max_bytes:
+            return total
+        # Trim to 90% so we don't evict again on the very next write
+        for _, size, full in sorted(files):
+            if total <= self.max_bytes * 0.9:
+                break
+            try:
+                os.remove(full)
+            except FileNotFoundError:
+                pass
+            total -= size
+        return total
+
+
+def check_public_url(url):
+    """
+    Refuse non-HTTP URLs and hosts on private networks (SSRF guard). Returns
+    the checked address to connect to, or None when private hosts are allowed.
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ('http', 'https') or not parts.hostname:
+        raise ImageFetchError("Only http(s) image URLs can be proxied.")
+    if setting('IMAGE_PROXY_ALLOW_PRIVATE_HOSTS', False):
+        return None
+    try:
+        addresses = [info[4][0] for info in socket.getaddrinfo(parts.hostname, parts.port or 443)]
+    except socket.gaierror:
+        raise ImageFetchError("Image host does not resolve.")
+    for address in addresses:
+        if not is_public(ipaddress.ip_address(address.split('%')[0])):
+            raise ImageFetchError("Image host is not publicly routable.")
+    return addresses[0]
+
+
+def is_public(ip):
+    return ip.is_global
+
+
+def pinned_request(method, url, address, timeout):
+    """
+    Request ``url`` from ``address`` rather than resolving its host again, so
+    DNS can't answer the check with a public address and the connection with
+    a private one. Host, SNI and the certificate check keep the hostname.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    class PinnedTLSAdapter(HTTPAdapter):
+        def init_poolmanager(self, *args, **kwargs):
+            kwargs.update(server_hostname=parts.hostname, assert_hostname=parts.hostname)
+            super().init_poolmanager(*args, **kwargs)
+
+    parts = urlsplit(url)
+    session = requests.Session()
+    # A proxy from the environment would resolve the name itself
+    session.trust_env = False
+    headers = {}
+    if address is not None:
+        host = f'[{address}]' if ':' in address else address
+        headers['Host'] = parts.netloc.rpartition('@')[2]
+        url = urlunsplit(parts._replace(netloc=f'{host}:{parts.port}' if parts.port else host))
+        if parts.scheme == 'https':
+            session.mount('https://', PinnedTLSAdapter())
+    return session.request(method, url, headers=headers, stream=True, timeout=timeout, allow_redirects=False)
+
+
+def open_public_url(url, method='GET', timeout=None):
+    """
+    The streamed response for ``url``, following up to MAX_REDIRECTS
+    redirects by hand so every hop passes check_public_url and connects to
+    the address it checked. The caller closes it.
+    """
+    import requests
+
+    timeout = timeout or setting('IMAGE_FETCH_TIMEOUT', 5)
+    for _ in range(MAX_REDIRECTS + 1):
+        address = check_public_url(url)
+        try:
+            response = pinned_request(method, url, address, timeout)
+        except requests.RequestException as e:
+            raise ImageFetchError(f"Could not fetch image: {e}")
+        if not response.is_redirect:
+            return response
+        url = urljoin(url, response.headers['Location'])
+        response.close()
+    raise ImageFetchError("Too many redirects.")
+
+
+def fetch_image(url):
+    """Download an image, following a few redirects, bounded in size and time."""
+    max_bytes = setting('IMAGE_FETCH_MAX_BYTES', 10 * 1024 * 1024)
+    with open_public_url(url) as response:
+        if response.status_code != 200:
+            raise ImageFetchError("Image URL answered %s." % response.status_code, response.status_code)
+        if not response.headers.get('Content-Type', '').startswith('image/'):
+            raise ImageFetchError("URL does not point to an image.", response.status_code)
+        data = BytesIO()
+        for chunk in response.iter_content(64 * 1024):
+            data.write(chunk)
+            if data.tell() > max_bytes:
+                raise ImageFetchError("Image is too large.", response.status_code)
+        return data.getvalue()
+
+def make_thumbnail(data, size):
+    from PIL import Image, ImageOps
+
+    # A few MB of compressed pixels can decode to gigabytes
+    max_pixels = setting('IMAGE_MAX_PIXELS', 40 * 1000 * 1000)
+    try:
+        image = Image.open(BytesIO(data))
+    except Image.DecompressionBombError:
+        raise ImageFetchError("Image has too many pixels.")
+    with image:
+        if image.width * image.height > max_pixels:
+            raise ImageFetchError("Image has too many pixels.")
+        image.draft('RGB', (size, size))  # lets JPEG decode at a reduced scale
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((size, size))
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'transparency' in image.info or 'A' in image.mode else 'RGB')
+        out = BytesIO()
+        image.save(out, 'WEBP', quality=80, method=4)
+    return out.getvalue()
+
+
+def mark_link(url, ok, status_code=None):
+    ImageLink.objects.update_or_create(
+        url=url, defaults={'ok': ok, 'status_code': status_code, 'checked_at': timezone.now()},
+    )
+
+
+def known_dead(url):
+    """True if the verifier (or an earlier fetch) found the URL dead recently."""
+    recheck_after = setting('IMAGE_LINK_RECHECK_AFTER', timedelta(days=1))
+    return ImageLink.objects.filter(
+        url=url, ok=False, checked_at__gte=timezone.now() - recheck_after,
+    ).exists()
+
+
+def get_thumbnail(url, size, cache=None):
+    """Path of the cached WebP thumbnail for ``url``, fetching it on a miss."""
+    cache = cache or ThumbnailCache()
+    path = cache.get(url, size)
+    if path is not None:
+        return path
+    if known_dead(url):
+        raise ImageFetchError("Image link is dead.")
+    try:
+        data = make_thumbnail(fetch_image(url), size)
+    except ImageFetchError as e:
+        mark_link(url, False, e.status_code)
+        raise
+    except OSError:
+        # Pillow could not decode it
+        mark_link(url, False)
+        raise ImageFetchError("URL does not contain a readable image.")
+    return cache.put(url, size, data)
@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import JoinRequest, VolunteerWork
+
+
+class Command(BaseCommand):
+    help = "Move volunteer work that ended more than ARCHIVE_AFTER ago (and its join requests) to the archive."
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        cutoff = now - settings.ARCHIVE_AFTER
+        with transaction.atomic():
+            work_ids = list(
+                VolunteerWork.objects.filter(archived=False, date__lt=cutoff).values_list('pk', flat=True)
+            )
+            VolunteerWork.objects.filter(pk__in=work_ids).update(archived=True, updated_at=now)
+            requests = JoinRequest.objects.filter(volunteer_work_id__in=work_ids, archived=False).update(archived=True)
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {len(work_ids)} volunteer works and {requests} join requests dated before {cutoff:%Y-%m-%d}."
+        ))
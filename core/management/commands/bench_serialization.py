@@ -0,0 +1,84 @@
+import time
+import uuid
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from core.models import Organisation, VolunteerWork
+from core.renderers import MessagePackRenderer, ORJSONRenderer
+from core.serializers import VolunteerWorkSerializer
+
+
+class Rollback(Exception):
+    pass
+
+
+def cpu_ms(func, repeat):
+    """Best-of-``repeat`` process CPU time of ``func()``, in milliseconds."""
+    best = None
+    for _ in range(repeat):
+        started = time.process_time()
+        result = func()
+        elapsed = (time.process_time() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+class Command(BaseCommand):
+    help = "Measure CPU per 1,000 volunteer works for the list serializer paths and renderers. Rolls back its fixtures."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000)
+        parser.add_argument('--participants', type=int, default=5, help="Participants per work.")
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, rows, participants, repeat, **options):
+        try:
+            with transaction.atomic():
+                self.report(*self.fixtures(rows, participants), repeat)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def fixtures(self, rows, participants):
+        run = uuid.uuid4().hex[:8]
+        users = User.objects.bulk_create([User(username=f'bench-{run}-{i}') for i in range(participants + 1)])
+        organisation_id = Organisation.default_id()
+        works = VolunteerWork.objects.bulk_create([
+            VolunteerWork(
+                title=f'Work {i}', description='Bench ' * 20, location='Somewhere',
+                date=timezone.now(), organizer=users[0], image_url='https://example.com/image.jpg',
+                organisation_id=organisation_id,
+                rating_count_4=i % 7, rating_count_5=i % 3,
+            )
+            for i in range(rows)
+        ])
+        through = VolunteerWork.participants.through
+        through.objects.bulk_create([
+            through(volunteerwork_id=work.pk, user_id=user.pk) for work in works for user in users[1:]
+        ])
+        return VolunteerWork.objects.filter(pk__in=[work.pk for work in works]).order_by('pk'), rows
+
+    def report(self, queryset, rows, repeat):
+        per_1k = 1000 / rows
+        slow_ms, data = cpu_ms(lambda: VolunteerWorkSerializer(
+            list(queryset.select_related('organizer').prefetch_related('participants')), many=True).data, repeat)
+        fast_ms, fast_data = cpu_ms(lambda: VolunteerWorkSerializer(queryset, many=True).data, repeat)
+        if [dict(row) for row in data] != list(fast_data):
+            self.stderr.write(self.style.WARNING("values() fast path output differs from the serializer"))
+
+        self.stdout.write(f"CPU ms per 1,000 works ({rows} rows, best of {repeat}):")
+        self.stdout.write(f"  serialize  ModelSerializer   {slow_ms * per_1k:8.1f}")
+        self.stdout.write(f"  serialize  values() path     {fast_ms * per_1k:8.1f}")
+        renderers = [JSONRenderer(), ORJSONRenderer()]
+        try:
+            import msgpack  # noqa: F401
+            renderers.append(MessagePackRenderer())
+        except ImportError:
+            self.stdout.write("  (msgpack not installed, skipping MessagePackRenderer)")
+        for renderer in renderers:
+            ms, body = cpu_ms(lambda: renderer.render(fast_data, renderer.media_type, {}), repeat)
+            self.stdout.write(f"  render     {type(renderer).__name__:<18}{ms * per_1k:8.1f}   {len(body) * per_1k / 1024:.0f} KiB")
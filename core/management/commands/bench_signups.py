@@ -0,0 +1,43 @@
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from core.registration import build_user, register_user
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Time the signup pipeline and report signups per second. Everything it creates is rolled back."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=200)
+        parser.add_argument(
+            '--hash-iterations', type=int, default=None,
+            help="Override PASSWORD_HASH_ITERATIONS for this run.",
+        )
+
+    def handle(self, *args, count, hash_iterations, **options):
+        run = uuid.uuid4().hex[:8]
+        overrides = {'PASSWORD_HASH_ITERATIONS': hash_iterations} if hash_iterations else {}
+        with override_settings(**overrides), CaptureQueriesContext(connection) as queries:
+            try:
+                with transaction.atomic():
+                    started = time.perf_counter()
+                    for i in range(count):
+                        name = f'bench-{run}-{i}'
+                        register_user(build_user(name, f'{name}@example.com', 'bench-pass-123', 'Bench', 'User'))
+                    elapsed = time.perf_counter() - started
+                    raise Rollback
+            except Rollback:
+                pass
+
+        self.stdout.write(
+            f"{count} signups in {elapsed:.2f}s: {count / elapsed:.1f} signups/s, "
+            f"{elapsed / count * 1000:.1f} ms and {len(queries) / count:.1f} queries each"
+        )
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from core import recommendations
+
+
+class Command(BaseCommand):
+    help = "Rebuild the work similarity matrix and per-user recommendation lists."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help="Recompute everything instead of only what changed.")
+
+    def handle(self, *args, **options):
+        works, users = recommendations.build(full=options['full'])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt similarities for {works} works and recommendations for {users} users."))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.hours import complete_work, due_works
+
+
+class Command(BaseCommand):
+    help = "Credit volunteer hours to the ledger for every work that has ended. Safe to rerun."
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        works = list(due_works(now).only('pk', 'organisation_id', 'category_id', 'date', 'duration'))
+        credited = sum(complete_work(work, now) for work in works)
+        self.stdout.write(self.style.SUCCESS(
+            f"Completed {len(works)} volunteer works, crediting hours to {credited} volunteers."
+        ))
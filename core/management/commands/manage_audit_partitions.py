@@ -0,0 +1,67 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from core.models import AuditEvent
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f'core_auditevent_p{month:%Y%m}'
+
+
+class Command(BaseCommand):
+    help = (
+        "Create upcoming monthly audit partitions and drop those past the retention "
+        "window. On databases without partitioning, old rows are deleted instead."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months-ahead', type=int, default=2)
+        parser.add_argument('--retain-months', type=int, default=12)
+
+    def handle(self, *args, **options):
+        this_month = timezone.now().date().replace(day=1)
+        cutoff = add_months(this_month, -options['retain_months'])
+
+        if connection.vendor != 'postgresql':
+            deleted, _ = AuditEvent.objects.filter(occurred_at__date__lt=cutoff).delete()
+            self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} audit events before {cutoff}."))
+            return
+
+        with connection.cursor() as cursor:
+            # Only future months: a range that already has rows sitting in the
+            # DEFAULT partition can't be attached.
+            for offset in range(1, options['months_ahead'] + 1):
+                start = add_months(this_month, offset)
+                cursor.execute(
+                    f"CREATE TABLE IF NOT EXISTS {partition_name(start)} PARTITION OF core_auditevent "
+                    f"FOR VALUES FROM ('{start}') TO ('{add_months(start, 1)}')"
+                )
+
+            cursor.execute(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "JOIN pg_class p ON p.oid = i.inhparent "
+                "WHERE p.relname = 'core_auditevent' AND c.relname LIKE 'core\\_auditevent\\_p%%'"
+            )
+            dropped = []
+            for (name,) in cursor.fetchall():
+                month = date(int(name[-6:-2]), int(name[-2:]), 1)
+                if add_months(month, 1) <= cutoff:
+                    cursor.execute(f'DROP TABLE {name}')
+                    dropped.append(name)
+
+            cursor.execute("DELETE FROM core_auditevent_default WHERE occurred_at < %s", [cutoff])
+            deleted = cursor.rowcount
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Audit partitions ready {options['months_ahead']} months ahead; "
+            f"dropped {len(dropped)} partitions and {deleted} default-partition rows before {cutoff}."
+        ))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.hours import refresh_leaderboards
+
+
+class Command(BaseCommand):
+    help = "Fold hours credited since the last run into the leaderboards. Run after complete_works."
+
+    def handle(self, *args, **options):
+        entries, boards = refresh_leaderboards()
+        self.stdout.write(self.style.SUCCESS(f"Ranked {entries} new ledger entries across {boards} leaderboards."))
@@ -0,0 +1,55 @@
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# What a cold lambda does before it can answer: load the WSGI app and the
+# URLconf (which pulls in every view and serializer module).
+BOOT_SNIPPET = (
+    "import time; t = time.perf_counter(); "
+    "import VolunteerHub.wsgi; "
+    "from django.urls import get_resolver; get_resolver().url_patterns; "
+    "print(time.perf_counter() - t)"
+)
+
+
+class Command(BaseCommand):
+    help = "Measure cold-start time of the WSGI entry point and break down import time by package."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--settings-module', action='append', dest='modules',
+                            help="Settings module to profile; repeat to compare (default: current).")
+        parser.add_argument('--repeat', type=int, default=5, help="Cold starts per settings module.")
+        parser.add_argument('--top', type=int, default=15, help="Packages to list in the breakdown.")
+
+    def boot(self, module, importtime=False):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=module)
+        cmd = [sys.executable] + (['-X', 'importtime'] if importtime else []) + ['-c', BOOT_SNIPPET]
+        result = subprocess.run(cmd, env=env, cwd=settings.BASE_DIR, capture_output=True, text=True, check=True)
+        return float(result.stdout.strip().splitlines()[-1]), result.stderr
+
+    def breakdown(self, stderr):
+        totals = defaultdict(int)
+        for line in stderr.splitlines():
+            if not line.startswith('import time:') or 'self [us]' in line:
+                continue
+            self_us, _, name = line[len('import time:'):].split('|')
+            totals[name.strip().split('.')[0]] += int(self_us)
+        return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+    def handle(self, *args, **options):
+        modules = options['modules'] or [os.environ.get('DJANGO_SETTINGS_MODULE', 'VolunteerHub.settings')]
+        for module in modules:
+            timings = [self.boot(module)[0] for _ in range(options['repeat'])]
+            _, stderr = self.boot(module, importtime=True)
+
+            self.stdout.write(self.style.MIGRATE_HEADING(module))
+            self.stdout.write(f"  cold start: median {statistics.median(timings) * 1000:.1f} ms, "
+                              f"min {min(timings) * 1000:.1f} ms over {len(timings)} runs")
+            self.stdout.write("  import time by top-level package (self time):")
+            for package, micros in self.breakdown(stderr)[:options['top']]:
+                self.stdout.write(f"    {package:<28} {micros / 1000:8.1f} ms")
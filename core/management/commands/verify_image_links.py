@@ -0,0 +1,50 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.images import ImageFetchError, open_public_url
+from core.models import EventSeries, ImageLink, Profile, VolunteerWork
+
+
+def probe(url, timeout):
+    # Every redirect hop is checked, so a public URL can't bounce us inward
+    try:
+        response = open_public_url(url, 'HEAD', timeout)
+        response.close()
+        if response.status_code in (403, 405):
+            # Some hosts refuse HEAD; ask for the body but don't read it
+            response = open_public_url(url, 'GET', timeout)
+            response.close()
+    except ImageFetchError:
+        return url, False, None
+    ok = response.status_code == 200 and response.headers.get('Content-Type', '').startswith('image/')
+    return url, ok, response.status_code
+
+
+class Command(BaseCommand):
+    help = "Check every stored image URL and record which ones are dead."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=8)
+        parser.add_argument('--timeout', type=float, default=5)
+
+    def handle(self, *args, **options):
+        urls = set()
+        for queryset in (
+            VolunteerWork.objects.values_list('image_url', flat=True),
+            EventSeries.objects.values_list('image_url', flat=True),
+            Profile.objects.values_list('profile_picture', flat=True),
+        ):
+            urls.update(url for url in queryset.distinct() if url)
+
+        now = timezone.now()
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            results = list(pool.map(lambda url: probe(url, options['timeout']), sorted(urls)))
+
+        ImageLink.objects.bulk_create(
+            [ImageLink(url=url, ok=ok, status_code=status_code, checked_at=now) for url, ok, status_code in results],
+            update_conflicts=True, unique_fields=['url'], update_fields=['ok', 'status_code', 'checked_at'],
+        )
+        dead = sum(1 for _, ok, _ in results if not ok)
+        self.stdout.write(self.style.SUCCESS(f"Checked {len(results)} image links, {dead} dead."))
@@ -0,0 +1,36 @@
+from django.db import migrations
+
+
+# auth_user belongs to django.contrib.auth, so these expression indexes are
+# managed here with raw SQL. They match the SQL Django emits for
+# ``istartswith`` on Postgres: UPPER(col::text) LIKE UPPER('term%').
+SEARCH_COLUMNS = ['username', 'first_name', 'last_name']
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for column in SEARCH_COLUMNS:
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS core_user_%s_upper_prefix '
+            'ON auth_user (UPPER(%s::text) text_pattern_ops)' % (column, column)
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for column in SEARCH_COLUMNS:
+        schema_editor.execute('DROP INDEX IF EXISTS core_user_%s_upper_prefix' % column)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('core', '0014_category_updated_at_profile_updated_at_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
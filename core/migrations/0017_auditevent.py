@@ -0,0 +1,80 @@
+# Generated by Django 5.1.2 on 2026-10-19 17:30
+
+import datetime
+
+import django.core.serializers.json
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+# Postgres gets a table range-partitioned by month on occurred_at. A
+# partitioned table's primary key must include the partition key, hence
+# (id, occurred_at); Django still addresses rows by id alone. Month
+# partitions are created ahead of time by manage_audit_partitions and the
+# DEFAULT partition catches anything outside them.
+PARTITIONED_TABLE_SQL = [
+    """
+    CREATE TABLE core_auditevent (
+        id bigint GENERATED BY DEFAULT AS IDENTITY,
+        occurred_at timestamp with time zone NOT NULL,
+        actor_id integer NULL,
+        action varchar(10) NOT NULL,
+        object_type varchar(50) NOT NULL,
+        object_id bigint NOT NULL,
+        changes jsonb NOT NULL,
+        PRIMARY KEY (id, occurred_at)
+    ) PARTITION BY RANGE (occurred_at)
+    """,
+    'CREATE TABLE core_auditevent_default PARTITION OF core_auditevent DEFAULT',
+    'CREATE INDEX core_audit_object_idx ON core_auditevent (object_type, object_id, occurred_at)',
+    'CREATE INDEX core_audit_actor_idx ON core_auditevent (actor_id, occurred_at)',
+]
+
+
+def create_table(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        for sql in PARTITIONED_TABLE_SQL:
+            schema_editor.execute(sql)
+        start = django.utils.timezone.now().date().replace(day=1)
+        end = (start + datetime.timedelta(days=32)).replace(day=1)
+        schema_editor.execute(
+            f"CREATE TABLE core_auditevent_p{start:%Y%m} PARTITION OF core_auditevent "
+            f"FOR VALUES FROM ('{start}') TO ('{end}')"
+        )
+    else:
+        schema_editor.create_model(apps.get_model('core', 'AuditEvent'))
+
+
+def drop_table(apps, schema_editor):
+    schema_editor.delete_model(apps.get_model('core', 'AuditEvent'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_idempotencykey'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[migrations.CreateModel(
+                name='AuditEvent',
+                fields=[
+                    ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                    ('occurred_at', models.DateTimeField(default=django.utils.timezone.now)),
+                    ('action', models.CharField(choices=[('create', 'Create'), ('update', 'Update'), ('delete', 'Delete')], max_length=10)),
+                    ('object_type', models.CharField(max_length=50)),
+                    ('object_id', models.BigIntegerField()),
+                    ('changes', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                    ('actor', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ],
+                options={
+                    'indexes': [models.Index(fields=['object_type', 'object_id', 'occurred_at'], name='core_audit_object_idx'), models.Index(fields=['actor', 'occurred_at'], name='core_audit_actor_idx')],
+                },
+            )],
+        ),
+        migrations.RunPython(create_table, drop_table),
+    ]
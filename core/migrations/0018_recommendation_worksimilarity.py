@@ -0,0 +1,43 @@
+# Generated by Django 5.1.2 on 2026-10-19 17:31
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_auditevent'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Recommendation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recommendations', to=settings.AUTH_USER_MODEL)),
+                ('volunteer_work', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.volunteerwork')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'rank'], name='core_recomm_user_id_7bc9bb_idx')],
+                'unique_together': {('user', 'volunteer_work')},
+            },
+        ),
+        migrations.CreateModel(
+            name='WorkSimilarity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+                ('similar_work', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.volunteerwork')),
+                ('work', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similarities', to='core.volunteerwork')),
+            ],
+            options={
+                'unique_together': {('work', 'similar_work')},
+            },
+        ),
+    ]
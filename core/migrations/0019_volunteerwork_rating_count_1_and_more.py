@@ -0,0 +1,60 @@
+# Generated by Django 5.1.2 on 2026-10-19 17:32
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_rating_counts(apps, schema_editor):
+    VolunteerWork = apps.get_model('core', 'VolunteerWork')
+    Review = apps.get_model('core', 'Review')
+    counts = {}
+    for work_id, rating, n in Review.objects.values_list('volunteer_work_id', 'rating').annotate(n=Count('pk')).order_by():
+        counts.setdefault(work_id, {})[f'rating_count_{rating}'] = n
+    for work_id, update in counts.items():
+        VolunteerWork.objects.filter(pk=work_id).update(**update)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_recommendation_worksimilarity'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='volunteerwork',
+            name='rating_count_1',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='volunteerwork',
+            name='rating_count_2',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='volunteerwork',
+            name='rating_count_3',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='volunteerwork',
+            name='rating_count_4',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='volunteerwork',
+            name='rating_count_5',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['volunteer_work', 'created_at'], name='core_review_volunte_7b6357_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['volunteer_work', 'rating', 'created_at'], name='core_review_volunte_d7debe_idx'),
+        ),
+        migrations.RunPython(backfill_rating_counts, migrations.RunPython.noop),
+    ]
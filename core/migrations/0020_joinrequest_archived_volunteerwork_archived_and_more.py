@@ -0,0 +1,37 @@
+# Generated by Django 5.1.2 on 2026-10-19 17:33
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_volunteerwork_rating_count_1_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='joinrequest',
+            name='archived',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='volunteerwork',
+            name='archived',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='joinrequest',
+            index=models.Index(condition=models.Q(('archived', False)), fields=['volunteer_work', 'status'], name='core_joinrequest_hot_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='volunteerwork',
+            index=models.Index(condition=models.Q(('archived', False)), fields=['date'], name='core_work_hot_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='volunteerwork',
+            index=models.Index(condition=models.Q(('archived', False)), fields=['category', 'date'], name='core_work_hot_category_idx'),
+        ),
+    ]
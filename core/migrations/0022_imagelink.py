@@ -0,0 +1,24 @@
+# Generated by Django 5.1.2 on 2026-10-19 17:35
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0021_eventseries_volunteerwork_series_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageLink',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.URLField(max_length=255, unique=True)),
+                ('ok', models.BooleanField(default=True)),
+                ('status_code', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('checked_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.1.2 on 2026-10-19 17:41
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+def seed_change_log(apps, schema_editor):
+    # Existing rows become the first sync a client pulls
+    ChangeLogEntry = apps.get_model('core', 'ChangeLogEntry')
+    for model_name, audience in (('category', None), ('volunteerwork', None), ('review', None), ('joinrequest', 'user_id')):
+        model = apps.get_model('core', model_name)
+        fields = ('pk', audience) if audience else ('pk',)
+        ChangeLogEntry.objects.bulk_create([
+            ChangeLogEntry(object_type=model_name, object_id=row[0], user_id=row[1] if audience else None)
+            for row in model.objects.order_by('pk').values_list(*fields)
+        ], batch_size=1000)
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0022_imagelink'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLogEntry',
+            fields=[
+                ('seq', models.BigAutoField(primary_key=True, serialize=False)),
+                ('object_type', models.CharField(max_length=50)),
+                ('object_id', models.BigIntegerField()),
+                ('deleted', models.BooleanField(default=False)),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('user', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['object_type', 'object_id'], name='core_changelog_object_idx')],
+            },
+        ),
+        migrations.RunPython(seed_change_log, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.2 on 2026-10-19 17:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0023_changelogentry'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='joinrequest',
+            name='decided_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='joinrequest',
+            index=models.Index(fields=['volunteer_work', 'created_at'], name='core_joinrequest_work_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='volunteerwork',
+            index=models.Index(fields=['organizer', 'date'], name='core_work_organizer_date_idx'),
+        ),
+    ]
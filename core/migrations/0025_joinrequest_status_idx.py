@@ -0,0 +1,19 @@
+# Generated by Django 5.1.2 on 2026-10-19 17:47
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0024_joinrequest_decided_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='joinrequest',
+            index=models.Index(fields=['status', 'created_at'], name='core_joinrequest_status_idx'),
+        ),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 5.1.2 on 2026-10-19 17:49
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def assign_default_organisation(apps, schema_editor):
+    # Everything that exists today belongs to the one organisation we had
+    Organisation = apps.get_model('core', 'Organisation')
+    slug = getattr(settings, 'DEFAULT_ORGANISATION', 'default')
+    organisation, _ = Organisation.objects.get_or_create(slug=slug, defaults={'name': slug.title()})
+    for model_name in ('category', 'volunteerwork', 'joinrequest'):
+        apps.get_model('core', model_name).objects.filter(organisation__isnull=True).update(organisation=organisation)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0025_joinrequest_status_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Organisation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('slug', models.SlugField(max_length=255, unique=True)),
+                ('domain', models.CharField(blank=True, max_length=255, null=True, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.RemoveIndex(
+            model_name='joinrequest',
+            name='core_joinrequest_status_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='volunteerwork',
+            name='core_work_hot_date_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='volunteerwork',
+            name='core_work_hot_category_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='volunteerwork',
+            name='core_work_organizer_date_idx',
+        ),
+        migrations.AlterField(
+            model_name='category',
+            name='name',
+            field=models.CharField(max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='category',
+            name='slug',
+            field=models.SlugField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='organisation',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.organisation'),
+        ),
+        migrations.AddField(
+            model_name='joinrequest',
+            name='organisation',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.organisation'),
+        ),
+        migrations.AddField(
+            model_name='volunteerwork',
+            name='organisation',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.organisation'),
+        ),
+        migrations.RunPython(assign_default_organisation, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.1.2 on 2026-10-19 17:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Separate from 0026: Postgres won't ALTER a table with FK checks still
+    # pending from the backfill in the same transaction
+
+    dependencies = [
+        ('core', '0026_organisation'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='category',
+            name='organisation',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.organisation'),
+        ),
+        migrations.AlterField(
+            model_name='joinrequest',
+            name='organisation',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.organisation'),
+        ),
+        migrations.AlterField(
+            model_name='volunteerwork',
+            name='organisation',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.organisation'),
+        ),
+        migrations.AddIndex(
+            model_name='joinrequest',
+            index=models.Index(fields=['organisation', 'status', 'created_at'], name='core_joinrequest_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='volunteerwork',
+            index=models.Index(condition=models.Q(('archived', False)), fields=['organisation', 'date'], name='core_work_hot_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='volunteerwork',
+            index=models.Index(condition=models.Q(('archived', False)), fields=['organisation', 'category', 'date'], name='core_work_hot_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='volunteerwork',
+            index=models.Index(fields=['organisation', 'organizer', 'date'], name='core_work_organizer_date_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='category',
+            constraint=models.UniqueConstraint(fields=('organisation', 'name'), name='unique_category_name_per_organisation'),
+        ),
+        migrations.AddConstraint(
+            model_name='category',
+            constraint=models.UniqueConstraint(fields=('organisation', 'slug'), name='unique_category_slug_per_organisation'),
+        ),
+    ]
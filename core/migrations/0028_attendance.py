@@ -0,0 +1,37 @@
+# Generated by Django 5.1.2 on 2026-10-19 17:54
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0027_organisation_required'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='volunteerwork',
+            name='duration',
+            field=models.DurationField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='Attendance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('checked_in_at', models.DateTimeField(blank=True, null=True)),
+                ('checked_out_at', models.DateTimeField(blank=True, null=True)),
+                ('organisation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.organisation')),
+                ('scanned_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendances', to=settings.AUTH_USER_MODEL)),
+                ('volunteer_work', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendances', to='core.volunteerwork')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['organisation', 'user'], name='core_attendance_user_idx')],
+                'constraints': [models.UniqueConstraint(fields=('volunteer_work', 'user'), name='unique_attendance')],
+            },
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.1.2 on 2026-10-19 18:10
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def assign_default_organisation(apps, schema_editor):
+    # Series predate tenancy, as did every user: both belong to the default organisation
+    Organisation = apps.get_model('core', 'Organisation')
+    slug = getattr(settings, 'DEFAULT_ORGANISATION', 'default')
+    organisation, _ = Organisation.objects.get_or_create(slug=slug, defaults={'name': slug.title()})
+    apps.get_model('core', 'EventSeries').objects.filter(organisation__isnull=True).update(organisation=organisation)
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    Organisation.members.through.objects.bulk_create(
+        [Organisation.members.through(organisation_id=organisation.pk, user_id=pk) for pk in User.objects.values_list('pk', flat=True)],
+        ignore_conflicts=True, batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0029_hours_ledger'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='eventseries',
+            name='core_events_start_677543_idx',
+        ),
+        migrations.AddField(
+            model_name='eventseries',
+            name='organisation',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.organisation'),
+        ),
+        migrations.AddField(
+            model_name='organisation',
+            name='members',
+            field=models.ManyToManyField(blank=True, related_name='organisations', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(assign_default_organisation, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.2 on 2026-10-19 18:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0032_recommendation_build'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='review',
+            name='core_review_volunte_7b6357_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='review',
+            name='core_review_volunte_d7debe_idx',
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['volunteer_work', 'created_at', 'id'], name='core_review_volunte_e12a68_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['volunteer_work', 'rating', 'created_at', 'id'], name='core_review_volunte_d09658_idx'),
+        ),
+    ]
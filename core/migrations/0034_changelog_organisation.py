@@ -0,0 +1,47 @@
+# Generated by Django 5.1.2 on 2026-10-19 18:33
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def assign_organisations(apps, schema_editor):
+    # Live objects tell us their organisation; tombstones of rows deleted
+    # before this migration fall back to the default one
+    ChangeLogEntry = apps.get_model('core', 'ChangeLogEntry')
+    owners = {
+        'volunteerwork': apps.get_model('core', 'VolunteerWork').objects.values_list('pk', 'organisation_id'),
+        'category': apps.get_model('core', 'Category').objects.values_list('pk', 'organisation_id'),
+        'joinrequest': apps.get_model('core', 'JoinRequest').objects.values_list('pk', 'organisation_id'),
+        'review': apps.get_model('core', 'Review').objects.values_list('pk', 'volunteer_work__organisation_id'),
+    }
+    for object_type, rows in owners.items():
+        by_organisation = {}
+        for pk, organisation_id in rows:
+            by_organisation.setdefault(organisation_id, []).append(pk)
+        for organisation_id, ids in by_organisation.items():
+            for start in range(0, len(ids), 1000):
+                ChangeLogEntry.objects.filter(object_type=object_type, object_id__in=ids[start:start + 1000]).update(
+                    organisation_id=organisation_id,
+                )
+    Organisation = apps.get_model('core', 'Organisation')
+    slug = getattr(settings, 'DEFAULT_ORGANISATION', 'default')
+    organisation, _ = Organisation.objects.get_or_create(slug=slug, defaults={'name': slug.title()})
+    ChangeLogEntry.objects.filter(organisation__isnull=True).update(organisation=organisation)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0033_review_ordering_tiebreak'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='changelogentry',
+            name='organisation',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.organisation'),
+        ),
+        migrations.RunPython(assign_organisations, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.2 on 2026-10-19 18:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0035_changelog_organisation_required'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='auditevent',
+            name='core_audit_object_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='auditevent',
+            name='core_audit_actor_idx',
+        ),
+        migrations.AddIndex(
+            model_name='auditevent',
+            index=models.Index(fields=['object_type', 'object_id', 'occurred_at', 'id'], name='core_audit_object_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auditevent',
+            index=models.Index(fields=['actor', 'occurred_at', 'id'], name='core_audit_actor_idx'),
+        ),
+    ]
@@ -1,8 +1,17 @@
-from django.db import models
+from collections import defaultdict
+
+from django.db import models, transaction
+from django.db.models import Count, F
+from django.core.serializers.json import DjangoJSONEncoder
 from django.contrib.auth.models import User
 from django.utils.text import slugify
-from django.db.models.signals import post_save
+from django.db.models.signals import pre_save, post_save, post_delete, m2m_changed
 from django.dispatch import receiver
+from django.utils import timezone
+
+from .recurrence import iter_occurrences, last_occurrence
+from django.core.cache import cache
+from .tenancy import current_organisation_id, default_organisation_slug, member_cache_key
 
 # Create your models here.
 
@@ -14,27 +23,131 @@ STAR_CHOICES = [
     (5, '⭐⭐⭐⭐⭐'),
 ]
 
+# Per-star review counters kept on VolunteerWork
+RATING_COUNT_FIELDS = {stars: f'rating_count_{stars}' for stars, _ in STAR_CHOICES}
+
 class Profile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     bio = models.TextField(blank=True, null=True)
     # profile_picture = models.ImageField(upload_to='profile_pics/', default='default_profile.jpg')
     profile_picture = models.URLField(max_length=255,blank=True,null=True)
     contact_info = models.CharField(max_length=255, blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.user.username
     
 
 
+
+class Organisation(models.Model):
+    """A tenant: one NGO hosted on this deployment."""
+    name = models.CharField(max_length=255)
+    slug = models.SlugField(max_length=255, unique=True)
+    # Requests to this host resolve to the organisation without a header
+    domain = models.CharField(max_length=255, unique=True, null=True, blank=True)
+    # Users who may pick this organisation with the X-Organisation header
+    members = models.ManyToManyField(User, related_name='organisations', blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.name
+
+    @classmethod
+    def default_id(cls):
+        slug = default_organisation_slug()
+        return cls.objects.get_or_create(slug=slug, defaults={'name': slug.title()})[0].pk
+
+
+class TenantManager(models.Manager):
+    """
+    Only the active organisation's rows while one is active (see
+    core.tenancy). ``organisation`` is the lookup to the owning
+    organisation, for models that reach it through a parent row.
+    """
+
+    def __init__(self, organisation='organisation'):
+        super().__init__()
+        self.organisation = organisation
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        organisation_id = current_organisation_id()
+        if organisation_id is not None:
+            queryset = queryset.filter(**{f'{self.organisation}_id': organisation_id})
+        return queryset
+
+
+class TenantModel(models.Model):
+    """
+    Row owned by one organisation. ``objects`` is scoped to the active
+    organisation; ``all_tenants`` is for jobs and bookkeeping that have to
+    reach every row. New rows are stamped with the active organisation.
+    """
+    organisation = models.ForeignKey(Organisation, related_name='+', on_delete=models.CASCADE)
+
+    objects = TenantManager()
+    all_tenants = models.Manager()
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if self.organisation_id is None:
+            self.organisation_id = self.owning_organisation_id()
+        super().save(*args, **kwargs)
+
+    def owning_organisation_id(self):
+        return current_organisation_id() or Organisation.default_id()
+
     
-class Category(models.Model):
-    name = models.CharField(max_length=255, unique=True)
-    slug = models.SlugField(max_length=255, unique=True, blank=True)
+class Category(TenantModel):
+    name = models.CharField(max_length=255)
+    slug = models.SlugField(max_length=255, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['organisation', 'name'], name='unique_category_name_per_organisation'),
+            models.UniqueConstraint(fields=['organisation', 'slug'], name='unique_category_slug_per_organisation'),
+        ]
     
     def __str__(self):
         return self.name
 
-class VolunteerWork(models.Model):
+class EventSeries(TenantModel):
+    """
+    A recurring volunteer event. Occurrences are expanded from ``rrule`` on
+    demand (see core.recurrence); a VolunteerWork row is only created for an
+    occurrence once someone wants to join it.
+    """
+    title = models.CharField(max_length=255)
+    description = models.TextField()
+    image_url = models.URLField(max_length=255, blank=True, null=True)
+    location = models.CharField(max_length=255)
+    start = models.DateTimeField()
+    rrule = models.CharField(max_length=255)
+    # Last occurrence for COUNT/UNTIL rules, so window queries can skip ended series
+    ends_at = models.DateTimeField(null=True, blank=True)
+    organizer = models.ForeignKey(User, related_name='organized_series', on_delete=models.CASCADE)
+    category = models.ForeignKey(Category, related_name='event_series', on_delete=models.SET_NULL, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['organisation', 'start', 'ends_at'], name='core_series_window_idx')]
+
+    def __str__(self):
+        return self.title
+
+    def save(self, *args, **kwargs):
+        self.ends_at = last_occurrence(self.start, self.rrule)
+        super().save(*args, **kwargs)
+
+    def occurrences(self, after=None, before=None):
+        return iter_occurrences(self.start, self.rrule, after=after, before=before)
+
+
+class VolunteerWork(TenantModel):
     title = models.CharField(max_length=255)
     description = models.TextField()
     image_url = models.URLField(max_length=255, blank=True, null=True)  # Changed from ImageField to URLField
@@ -43,16 +156,54 @@ class VolunteerWork(models.Model):
     organizer = models.ForeignKey(User, related_name='organized_works', on_delete=models.CASCADE)
     participants = models.ManyToManyField(User, related_name='participated_works', blank=True)
     category = models.ForeignKey(Category, related_name='volunteer_works', on_delete=models.SET_NULL, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    # Maintained by the Review signals below so ratings never need a scan
+    rating_count_1 = models.PositiveIntegerField(default=0)
+    rating_count_2 = models.PositiveIntegerField(default=0)
+    rating_count_3 = models.PositiveIntegerField(default=0)
+    rating_count_4 = models.PositiveIntegerField(default=0)
+    rating_count_5 = models.PositiveIntegerField(default=0)
+    # Set by archive_past_works once the event is well in the past; default
+    # listings only read the hot (unarchived) rows through partial indexes
+    archived = models.BooleanField(default=False)
+    # Set when this row is a materialized occurrence of a recurring series
+    series = models.ForeignKey(EventSeries, related_name='occurrence_works', on_delete=models.CASCADE, null=True, blank=True)
+    # Planned length; counts as attended time for anyone who doesn't scan out
+    duration = models.DurationField(null=True, blank=True)
+    # Set by complete_works when the hours for this work go into the ledger
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Tenant first, so one big organisation's rows don't dilute another's scans
+            models.Index(fields=['organisation', 'date'], condition=models.Q(archived=False), name='core_work_hot_date_idx'),
+            models.Index(fields=['organisation', 'category', 'date'], condition=models.Q(archived=False), name='core_work_hot_category_idx'),
+            # Organizer analytics walk all of an organizer's works, archived included
+            models.Index(fields=['organisation', 'organizer', 'date'], name='core_work_organizer_date_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['series', 'date'], condition=models.Q(series__isnull=False), name='unique_series_occurrence'),
+        ]
 
     def __str__(self):
         return self.title
+
+    def rating_histogram(self):
+        return {stars: getattr(self, field) for stars, field in RATING_COUNT_FIELDS.items()}
     
     def average_rating(self):
-        reviews = self.reviews.all()
-        if reviews.exists():
-            return sum(review.rating for review in reviews) / reviews.count()
+        histogram = self.rating_histogram()
+        total = sum(histogram.values())
+        if total:
+            return sum(stars * count for stars, count in histogram.items()) / total
         return 0
 
+    def refresh_rating_counts(self):
+        """Recount the per-star counters from the reviews table."""
+        counts = dict(self.reviews.values_list('rating').annotate(n=Count('pk')).order_by())
+        update = {field: counts.get(stars, 0) for stars, field in RATING_COUNT_FIELDS.items()}
+        VolunteerWork.all_tenants.filter(pk=self.pk).update(updated_at=timezone.now(), **update)
+
 
 
 class Review(models.Model):
@@ -61,19 +212,390 @@ class Review(models.Model):
     rating = models.IntegerField(choices=STAR_CHOICES)
     comment = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Tenant-owned through its work
+    objects = TenantManager('volunteer_work__organisation')
+    all_tenants = models.Manager()
 
     class Meta:
         unique_together = ('volunteer_work', 'user')
+        indexes = [
+            models.Index(fields=['volunteer_work', 'created_at', 'id']),
+            models.Index(fields=['volunteer_work', 'rating', 'created_at', 'id']),
+        ]
 
     def __str__(self):
         return f'{self.volunteer_work.title} - {self.user.username} - {self.get_rating_display()}'
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember what the counters currently include for this review
+        loaded = dict(zip(field_names, values))
+        if 'volunteer_work_id' in loaded and 'rating' in loaded:
+            instance._counted = (loaded['volunteer_work_id'], loaded['rating'])
+        return instance
     
 
-class JoinRequest(models.Model):
+class JoinRequest(TenantModel):
     volunteer_work = models.ForeignKey(VolunteerWork, related_name='join_requests', on_delete=models.CASCADE)
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
     status = models.CharField(max_length=20, choices=[('pending', 'Pending'), ('approved', 'Approved'), ('rejected', 'Rejected')], default='pending')
+    # When the organizer approved or rejected it; feeds approval latency
+    decided_at = models.DateTimeField(null=True, blank=True)
+    archived = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['volunteer_work', 'status'], condition=models.Q(archived=False), name='core_joinrequest_hot_idx'),
+            models.Index(fields=['volunteer_work', 'created_at'], name='core_joinrequest_work_idx'),
+            # Admin moderation queue: filter by status, newest first
+            models.Index(fields=['organisation', 'status', 'created_at'], name='core_joinrequest_status_idx'),
+        ]
 
     def __str__(self):
         return f'{self.user.username} - {self.volunteer_work.title} ({self.status})'
+
+    def owning_organisation_id(self):
+        return self.volunteer_work.organisation_id
+
+
+class Attendance(TenantModel):
+    """A participant's presence at a volunteer work, recorded from QR scans at the door (core/checkin.py)."""
+    volunteer_work = models.ForeignKey(VolunteerWork, related_name='attendances', on_delete=models.CASCADE)
+    user = models.ForeignKey(User, related_name='attendances', on_delete=models.CASCADE)
+    # Null when only the scan on the way out reached us
+    checked_in_at = models.DateTimeField(null=True, blank=True)
+    checked_out_at = models.DateTimeField(null=True, blank=True)
+    scanned_by = models.ForeignKey(User, null=True, blank=True, related_name='+', on_delete=models.SET_NULL)
+
+    class Meta:
+        constraints = [
+            # The conflict target of the batch check-in upserts
+            models.UniqueConstraint(fields=['volunteer_work', 'user'], name='unique_attendance'),
+        ]
+        indexes = [
+            models.Index(fields=['organisation', 'user'], name='core_attendance_user_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.user.username} at {self.volunteer_work.title}'
+
+    def owning_organisation_id(self):
+        return self.volunteer_work.organisation_id
+
+
+class HoursLedgerEntry(TenantModel):
+    """
+    Hours credited to a volunteer for a completed work (core/hours.py).
+    Append-only: rows outlive the work, keeping its category and date.
+    """
+    user = models.ForeignKey(User, related_name='hours_ledger', on_delete=models.CASCADE)
+    volunteer_work = models.ForeignKey(VolunteerWork, null=True, blank=True, related_name='+', on_delete=models.SET_NULL)
+    category = models.ForeignKey(Category, null=True, blank=True, related_name='+', on_delete=models.SET_NULL)
+    worked_at = models.DateTimeField()
+    hours = models.DecimalField(max_digits=8, decimal_places=2)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Cleared once refresh_leaderboards has folded the row into the rankings
+    ranked = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['organisation', 'user', 'worked_at'], name='core_ledger_user_idx'),
+            models.Index(fields=['created_at'], condition=models.Q(ranked=False), name='core_ledger_unranked_idx'),
+        ]
+
+
+class VolunteerHours(TenantModel):
+    """Running total of a user's ledger hours, bumped in the same transaction as each credit."""
+    user = models.ForeignKey(User, related_name='volunteer_hours', on_delete=models.CASCADE)
+    hours = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['organisation', 'user'], name='unique_volunteer_hours'),
+        ]
+
+
+class LeaderboardEntry(TenantModel):
+    """
+    A user's precomputed position on one leaderboard. ``board`` is 'all' or
+    'category-<id>'; ``period`` is '' (all time), 'YYYY' or 'YYYY-MM'.
+    """
+    board = models.CharField(max_length=50)
+    period = models.CharField(max_length=7, blank=True)
+    user = models.ForeignKey(User, related_name='+', on_delete=models.CASCADE)
+    hours = models.DecimalField(max_digits=10, decimal_places=2)
+    rank = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['organisation', 'board', 'period', 'user'], name='unique_leaderboard_entry'),
+        ]
+        indexes = [
+            # Serving reads pages by rank; re-ranking reads bands by hours
+            models.Index(fields=['organisation', 'board', 'period', 'rank'], name='core_leaderboard_rank_idx'),
+            models.Index(fields=['organisation', 'board', 'period', 'hours'], name='core_leaderboard_hours_idx'),
+        ]
+
+
+class IdempotencyKey(models.Model):
+    """Stored response for a write request sent with an Idempotency-Key header."""
+    scope = models.CharField(max_length=64)
+    key = models.CharField(max_length=255)
+    request_fingerprint = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True)
+    response_body = models.JSONField(null=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['scope', 'key'], name='unique_idempotency_key_per_scope'),
+        ]
+
+    def __str__(self):
+        return f'{self.scope} - {self.key}'
+
+
+class AuditEvent(models.Model):
+    """
+    Append-only record of a change to a domain object. On Postgres the table is
+    range-partitioned by month on occurred_at (see migration 0017 and the
+    manage_audit_partitions command), so its primary key is (id, occurred_at).
+    """
+    ACTION_CHOICES = [('create', 'Create'), ('update', 'Update'), ('delete', 'Delete')]
+
+    occurred_at = models.DateTimeField(default=timezone.now)
+    # No DB constraint: history has to outlive the users it mentions
+    actor = models.ForeignKey(User, null=True, blank=True, related_name='+', on_delete=models.DO_NOTHING, db_constraint=False)
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    object_type = models.CharField(max_length=50)
+    object_id = models.BigIntegerField()
+    changes = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['object_type', 'object_id', 'occurred_at', 'id'], name='core_audit_object_idx'),
+            models.Index(fields=['actor', 'occurred_at', 'id'], name='core_audit_actor_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.object_type}#{self.object_id} {self.action}'
+
+
+class WorkSimilarity(models.Model):
+    """One entry of the sparse item-item similarity matrix (top neighbours per work)."""
+    work = models.ForeignKey(VolunteerWork, related_name='similarities', on_delete=models.CASCADE)
+    similar_work = models.ForeignKey(VolunteerWork, related_name='+', on_delete=models.CASCADE)
+    score = models.FloatField()
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('work', 'similar_work')
+
+    def __str__(self):
+        return f'{self.work_id} ~ {self.similar_work_id} ({self.score:.3f})'
+
+
+class RecommendationBuild(models.Model):
+    """
+    A finished ``build_recommendations`` run. ``started_at`` is taken before
+    any data is read, so the next incremental run picks up whatever changed
+    while this one was working.
+    """
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField(auto_now_add=True)
+    full = models.BooleanField(default=False)
+    works = models.PositiveIntegerField(default=0)
+    users = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        get_latest_by = 'started_at'
+
+    def __str__(self):
+        return f'{"Full" if self.full else "Incremental"} build at {self.started_at:%Y-%m-%d %H:%M}'
+
+
+class Recommendation(models.Model):
+    """Precomputed top-K upcoming works for a user."""
+    user = models.ForeignKey(User, related_name='recommendations', on_delete=models.CASCADE)
+    volunteer_work = models.ForeignKey(VolunteerWork, related_name='+', on_delete=models.CASCADE)
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()
+
+    class Meta:
+        unique_together = ('user', 'volunteer_work')
+        indexes = [models.Index(fields=['user', 'rank'])]
+
+    def __str__(self):
+        return f'{self.user} - {self.volunteer_work_id} (#{self.rank})'
+
+
+class ImageLink(models.Model):
+    """Last known health of an external image URL (work images, profile pictures)."""
+    url = models.URLField(max_length=255, unique=True)
+    ok = models.BooleanField(default=True)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    checked_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f'{self.url} ({"ok" if self.ok else "dead"})'
+
+
+class ChangeLogEntry(models.Model):
+    """
+    Latest change to a synced object, for /api/sync/. Each change replaces the
+    object's previous entry under a new, higher ``seq``, so the log holds one
+    row per object (deleted ones as tombstones) and a client's cursor is just
+    the last seq it has seen. Clients page through their organisation's rows
+    only; ``user`` marks rows only that user may pull.
+    """
+    seq = models.BigAutoField(primary_key=True)
+    organisation = models.ForeignKey(Organisation, related_name='+', on_delete=models.CASCADE, db_index=False)
+    object_type = models.CharField(max_length=50)
+    object_id = models.BigIntegerField()
+    deleted = models.BooleanField(default=False)
+    user = models.ForeignKey(User, null=True, blank=True, related_name='+', on_delete=models.DO_NOTHING, db_constraint=False)
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['object_type', 'object_id'], name='core_changelog_object_idx'),
+            # /api/sync/ walks one organisation's log in seq order
+            models.Index(fields=['organisation', 'seq'], name='core_changelog_org_seq_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.seq}: {self.object_type}#{self.object_id}{" deleted" if self.deleted else ""}'
+
+    @classmethod
+    def record(cls, object_type, organisation_id, ids, deleted=False, user_id=None):
+        """
+        Log ``ids`` once the surrounding transaction commits. Seqs are then
+        handed out in commit order (bar the few milliseconds the write itself
+        takes, see core.sync), however long the transaction ran.
+        """
+        ids = list(ids)
+        if not ids:
+            return
+
+        def write():
+            with transaction.atomic():
+                cls.objects.filter(object_type=object_type, object_id__in=ids).delete()
+                cls.objects.bulk_create([
+                    cls(organisation_id=organisation_id, object_type=object_type, object_id=object_id, deleted=deleted, user_id=user_id)
+                    for object_id in ids
+                ])
+
+        transaction.on_commit(write)
+
+
+# VolunteerWork.updated_at doubles as the validator for ETag / Last-Modified,
+# so anything that changes the serialized work (reviews feed average_rating,
+# participants are listed by id, the organizer by username, category lists
+# by name and slug) has to bump it as well, and log the work for the sync
+# API since these updates bypass the model signals.
+
+def log_volunteer_works(rows):
+    """Log ``rows`` of (work id, organisation id) under each work's organisation."""
+    by_organisation = defaultdict(list)
+    for work_id, organisation_id in rows:
+        by_organisation[organisation_id].append(work_id)
+    for organisation_id, ids in by_organisation.items():
+        ChangeLogEntry.record('volunteerwork', organisation_id, ids)
+
+
+def touch_volunteer_works(**filters):
+    rows = list(VolunteerWork.all_tenants.filter(**filters).values_list('pk', 'organisation_id'))
+    VolunteerWork.all_tenants.filter(pk__in=[pk for pk, _ in rows]).update(updated_at=timezone.now())
+    log_volunteer_works(rows)
+
+
+def count_rating(work_id, stars, delta):
+    field = RATING_COUNT_FIELDS[stars]
+    if VolunteerWork.all_tenants.filter(pk=work_id).update(updated_at=timezone.now(), **{field: F(field) + delta}):
+        log_volunteer_works(VolunteerWork.all_tenants.filter(pk=work_id).values_list('pk', 'organisation_id'))
+
+
+@receiver(post_save, sender=Review)
+def count_review_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    current = (instance.volunteer_work_id, instance.rating)
+    counted = getattr(instance, '_counted', None)
+    if created:
+        count_rating(*current, 1)
+    elif counted is None:
+        # Saved through an instance that wasn't loaded from the DB
+        instance.volunteer_work.refresh_rating_counts()
+    elif counted != current:
+        count_rating(*counted, -1)
+        count_rating(*current, 1)
+    else:
+        touch_volunteer_works(pk=instance.volunteer_work_id)
+    instance._counted = current
+
+
+@receiver(post_delete, sender=Review)
+def count_review_on_delete(sender, instance, **kwargs):
+    count_rating(*getattr(instance, '_counted', (instance.volunteer_work_id, instance.rating)), -1)
+
+
+@receiver(m2m_changed, sender=VolunteerWork.participants.through)
+def touch_work_on_participants_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            touch_volunteer_works(pk=instance.pk)
+    elif action in ('post_add', 'post_remove') and pk_set:
+        touch_volunteer_works(pk__in=pk_set)
+    elif action == 'pre_clear':
+        # After the clear we can no longer tell which works the user was in
+        touch_volunteer_works(participants=instance)
+
+
+def fields_changed(instance, fields, update_fields):
+    if instance.pk is None or (update_fields is not None and not set(fields) & set(update_fields)):
+        return False
+    saved = type(instance)._base_manager.filter(pk=instance.pk).values(*fields).first()
+    return saved is not None and any(saved[field] != getattr(instance, field) for field in fields)
+
+
+@receiver(pre_save, sender=User)
+def note_renamed_organizer(sender, instance, raw=False, update_fields=None, **kwargs):
+    # Logins save last_login through update_fields and skip the lookup
+    instance._renamed = not raw and fields_changed(instance, ['username'], update_fields)
+
+
+@receiver(post_save, sender=User)
+def touch_works_of_renamed_organizer(sender, instance, **kwargs):
+    if getattr(instance, '_renamed', False):
+        touch_volunteer_works(organizer=instance)
+        instance._renamed = False
+
+
+@receiver(pre_save, sender=Category)
+def note_renamed_category(sender, instance, raw=False, update_fields=None, **kwargs):
+    instance._renamed = not raw and fields_changed(instance, ['name', 'slug'], update_fields)
+
+
+@receiver(post_save, sender=Category)
+def touch_works_of_renamed_category(sender, instance, **kwargs):
+    if getattr(instance, '_renamed', False):
+        touch_volunteer_works(category=instance)
+        instance._renamed = False
+
+
+@receiver(m2m_changed, sender=Organisation.members.through)
+def forget_memberships(sender, instance, action, reverse, pk_set, **kwargs):
+    # TenantMiddleware caches membership; drop it so removals apply at once
+    if action in ('post_add', 'post_remove') and pk_set:
+        pairs = [(pk, instance.pk) if reverse else (instance.pk, pk) for pk in pk_set]
+    elif action == 'pre_clear':
+        related = instance.organisations if reverse else instance.members
+        pairs = [(pk, instance.pk) if reverse else (instance.pk, pk) for pk in related.values_list('pk', flat=True)]
+    else:
+        return
+    cache.delete_many([member_cache_key(*pair) for pair in pairs])
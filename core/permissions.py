@@ -6,12 +6,11 @@ class IsOrganizerOrReadOnly(permissions.BasePermission):
     """
 
     def has_permission(self, request, view):
-        def has_permission(self, request, view):
-            # Allow any user to list or retrieve
-            if view.action in ['list', 'retrieve']:
-                return True
-            # For other actions, check if the user is authenticated
-            return request.user and request.user.is_authenticated
+        # Allow any user to list or retrieve
+        if request.method in permissions.SAFE_METHODS:
+            return True
+        # For other actions, check if the user is authenticated
+        return bool(request.user and request.user.is_authenticated)
 
     def has_object_permission(self, request, view, obj):
         # Read permissions are allowed for any authenticated user
@@ -0,0 +1,204 @@
+"""
+"Works you may like": item-item collaborative filtering over who took part
+in (and how they rated) each volunteer work.
+
+The similarity matrix is sparse and small enough to build with plain dicts,
+which keeps NumPy/SciPy out of the serverless bundle. ``build`` is run
+offline by the ``build_recommendations`` command; requests only read the
+stored top-K list through the cache.
+"""
+import math
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from .models import Organisation, Recommendation, RecommendationBuild, Review, VolunteerWork, WorkSimilarity
+from .tenancy import tenant_cache_key
+
+NEIGHBOURS_PER_WORK = 50
+TOP_K = 20
+CACHE_TIMEOUT = 60 * 60
+
+
+def cache_key(user_id, organisation_id=None):
+    return tenant_cache_key(f'recommendations:{user_id}', organisation_id)
+
+
+def interaction_weights(work_ids=None, user_ids=None):
+    """
+    user -> {work: weight}, optionally only for ``work_ids`` and/or
+    ``user_ids``. Taking part counts 1; a review moves that between 0 (one
+    star) and 2 (five stars), so disliked works stop pulling in similar ones.
+    """
+    participations = VolunteerWork.participants.through.objects.all()
+    reviews = Review.all_tenants.all()
+    if work_ids is not None:
+        participations = participations.filter(volunteerwork_id__in=work_ids)
+        reviews = reviews.filter(volunteer_work_id__in=work_ids)
+    if user_ids is not None:
+        participations = participations.filter(user_id__in=user_ids)
+        reviews = reviews.filter(user_id__in=user_ids)
+
+    weights = defaultdict(dict)
+    for work_id, user_id in participations.values_list('volunteerwork_id', 'user_id'):
+        weights[user_id][work_id] = 1.0
+    for work_id, user_id, rating in reviews.values_list('volunteer_work_id', 'user_id', 'rating'):
+        weights[user_id][work_id] = 1.0 + (rating - 3) / 2
+    return weights
+
+
+def squared_norms(work_ids):
+    """work -> sum of squared interaction weights, read for ``work_ids`` only."""
+    norms = defaultdict(float)
+    for history in interaction_weights(work_ids=work_ids).values():
+        for work_id, weight in history.items():
+            norms[work_id] += weight * weight
+    return norms
+
+
+def similarity_rows(weights, works, norms):
+    """
+    Cosine similarity rows for ``works`` against every co-occurring work.
+    ``weights`` must hold the full history of everyone who interacted with
+    ``works``, and ``norms`` every work in those histories.
+    """
+    dots = defaultdict(lambda: defaultdict(float))
+    for history in weights.values():
+        touched = [work_id for work_id in history if work_id in works]
+        for work_id in touched:
+            for other_id, other_weight in history.items():
+                if other_id != work_id:
+                    dots[work_id][other_id] += history[work_id] * other_weight
+
+    rows = {}
+    for work_id in works:
+        row = {
+            other_id: dot / math.sqrt(norms[work_id] * norms[other_id])
+            for other_id, dot in dots[work_id].items() if dot > 0
+        }
+        rows[work_id] = sorted(row.items(), key=lambda item: item[1], reverse=True)[:NEIGHBOURS_PER_WORK]
+    return rows
+
+
+def score_user(user_id, history, similarities, upcoming, organized):
+    scores = defaultdict(float)
+    for work_id, weight in history.items():
+        for other_id, score in similarities.get(work_id, ()):
+            if other_id in upcoming and other_id not in history and other_id not in organized:
+                scores[other_id] += weight * score
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:TOP_K]
+    return [
+        Recommendation(user_id=user_id, volunteer_work_id=work_id, score=score, rank=rank)
+        for rank, (work_id, score) in enumerate(ranked, start=1)
+    ]
+
+
+def stored_rows(works):
+    """The similarity rows last built for ``works``."""
+    rows = defaultdict(list)
+    stored = WorkSimilarity.objects.filter(work_id__in=works).order_by('work_id', '-score')
+    for work_id, other_id, score in stored.values_list('work_id', 'similar_work_id', 'score'):
+        rows[work_id].append((other_id, score))
+    return rows
+
+
+def users_of(work_ids):
+    return set(interaction_weights(work_ids=work_ids))
+
+
+def build(full=False):
+    """
+    Rebuild similarity rows and per-user lists. Incremental runs only redo
+    works whose updated_at moved since the last build started (reviews and
+    participant changes bump it), the works they co-occur with, and the
+    users who interacted with any of those; only their interactions are
+    read. Returns ``(works, users)`` rebuilt.
+    """
+    # Taken before reading anything: changes made while we run are newer
+    # than the marker and get picked up next time
+    started_at = timezone.now()
+    last_build = None if full else RecommendationBuild.objects.aggregate(last=Max('started_at'))['last']
+
+    if last_build is None:
+        weights = interaction_weights()
+        affected_works = set(VolunteerWork.all_tenants.values_list('pk', flat=True))
+    else:
+        changed = set(VolunteerWork.all_tenants.filter(updated_at__gt=last_build).values_list('pk', flat=True))
+        affected_works = set(changed)
+        # Works that co-occur with a changed one now, or did at the last build
+        for history in interaction_weights(user_ids=users_of(changed)).values():
+            affected_works.update(history)
+        affected_works.update(
+            WorkSimilarity.objects.filter(similar_work_id__in=changed).values_list('work_id', flat=True)
+        )
+        weights = interaction_weights(user_ids=users_of(affected_works))
+    affected_users = [user_id for user_id, history in weights.items() if affected_works.intersection(history)]
+    if not affected_works:
+        RecommendationBuild.objects.create(started_at=started_at, full=full)
+        return 0, 0
+
+    # Scoring needs the rows of every work in an affected user's history;
+    # the ones we don't rebuild haven't changed and come from the table
+    needed = set(affected_works)
+    for user_id in affected_users:
+        needed.update(weights[user_id])
+    similarities = stored_rows(needed - affected_works)
+    similarities.update(similarity_rows(weights, affected_works, squared_norms(needed)))
+
+    upcoming = set(VolunteerWork.all_tenants.filter(date__gte=timezone.now()).values_list('pk', flat=True))
+    organized = defaultdict(set)
+    organized_works = VolunteerWork.all_tenants.filter(organizer_id__in=affected_users)
+    for work_id, organizer_id in organized_works.values_list('pk', 'organizer_id'):
+        organized[organizer_id].add(work_id)
+
+    with transaction.atomic():
+        WorkSimilarity.objects.filter(work_id__in=affected_works).delete()
+        WorkSimilarity.objects.bulk_create([
+            WorkSimilarity(work_id=work_id, similar_work_id=other_id, score=score)
+            for work_id in affected_works for other_id, score in similarities[work_id]
+        ], batch_size=1000)
+
+        Recommendation.objects.filter(user_id__in=affected_users).delete()
+        recommendations = []
+        for user_id in affected_users:
+            recommendations.extend(
+                score_user(user_id, weights[user_id], similarities, upcoming, organized[user_id])
+            )
+        Recommendation.objects.bulk_create(recommendations, batch_size=1000)
+        RecommendationBuild.objects.create(
+            started_at=started_at, full=full, works=len(affected_works), users=len(affected_users),
+        )
+
+    # Lists are cached per organisation the user has browsed
+    organisation_ids = list(Organisation.objects.values_list('pk', flat=True))
+    cache.delete_many([
+        cache_key(user_id, organisation_id) for user_id in affected_users for organisation_id in organisation_ids
+    ])
+    return len(affected_works), len(affected_users)
+
+
+def popular_upcoming_ids(user, limit=TOP_K):
+    """Fallback for users without history: the busiest upcoming works."""
+    return list(
+        VolunteerWork.objects
+        .filter(date__gte=timezone.now())
+        .exclude(organizer=user).exclude(participants=user)
+        .annotate(num_participants=Count('participants'))
+        .order_by('-num_participants', 'date')
+        .values_list('pk', flat=True)[:limit]
+    )
+
+
+def recommended_work_ids(user):
+    key = cache_key(user.pk)
+    ids = cache.get(key)
+    if ids is None:
+        recommendations = Recommendation.objects.filter(user=user, volunteer_work__in=VolunteerWork.objects.all())
+        ids = list(recommendations.order_by('rank').values_list('volunteer_work_id', flat=True))
+        if not ids:
+            ids = popular_upcoming_ids(user)
+        cache.set(key, ids, CACHE_TIMEOUT)
+    return ids
@@ -0,0 +1,153 @@
+"""
+A small subset of RFC 5545 recurrence rules, enough for organizer series:
+
+    FREQ=DAILY|WEEKLY|MONTHLY [;INTERVAL=n] [;BYDAY=MO,WE,..] [;COUNT=n] [;UNTIL=YYYYMMDD[THHMMSSZ]]
+
+Occurrences are produced lazily by ``iter_occurrences`` so a series never
+needs one stored row per date.
+"""
+import calendar
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+FREQUENCIES = ('DAILY', 'WEEKLY', 'MONTHLY')
+WEEKDAYS = ['MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU']
+MAX_COUNT = 1000
+# Far enough for any real series, and keeps date arithmetic clear of year 9999
+MAX_UNTIL = datetime(2100, 1, 1, tzinfo=dt_timezone.utc)
+PERIOD_DAYS = {'DAILY': 1, 'WEEKLY': 7, 'MONTHLY': 31}
+
+
+def parse_rrule(rule):
+    """Parse ``rule`` into a dict, raising ValueError when it isn't supported."""
+    parts = {}
+    for chunk in rule.strip().upper().split(';'):
+        if not chunk:
+            continue
+        name, sep, value = chunk.partition('=')
+        if not sep or not value:
+            raise ValueError(f"Malformed rule part '{chunk}'.")
+        parts[name] = value
+
+    freq = parts.pop('FREQ', None)
+    if freq not in FREQUENCIES:
+        raise ValueError(f"FREQ must be one of {', '.join(FREQUENCIES)}.")
+    parsed = {'freq': freq, 'interval': 1, 'byday': [], 'count': None, 'until': None}
+
+    if 'INTERVAL' in parts:
+        parsed['interval'] = int(parts.pop('INTERVAL'))
+        if parsed['interval'] < 1:
+            raise ValueError("INTERVAL must be positive.")
+    if 'BYDAY' in parts:
+        if freq != 'WEEKLY':
+            raise ValueError("BYDAY is only supported with FREQ=WEEKLY.")
+        days = parts.pop('BYDAY').split(',')
+        if any(day not in WEEKDAYS for day in days):
+            raise ValueError("BYDAY takes two-letter weekdays such as MO,WE.")
+        parsed['byday'] = sorted({WEEKDAYS.index(day) for day in days})
+    if 'COUNT' in parts:
+        parsed['count'] = int(parts.pop('COUNT'))
+        if not 1 <= parsed['count'] <= MAX_COUNT:
+            raise ValueError(f"COUNT must be between 1 and {MAX_COUNT}.")
+    if 'UNTIL' in parts:
+        value = parts.pop('UNTIL').rstrip('Z')
+        fmt = '%Y%m%dT%H%M%S' if 'T' in value else '%Y%m%d'
+        parsed['until'] = datetime.strptime(value, fmt).replace(tzinfo=dt_timezone.utc)
+        if parsed['until'] >= MAX_UNTIL:
+            raise ValueError(f"UNTIL must be before {MAX_UNTIL:%Y-%m-%d}.")
+    if parts:
+        raise ValueError(f"Unsupported rule parts: {', '.join(sorted(parts))}.")
+    return parsed
+
+
+def month_offset(start, months):
+    index = start.month - 1 + months
+    return start.year + index // 12, index % 12 + 1
+
+
+def periods_before(start, moment, rule):
+    """How many whole periods can be skipped without passing ``moment``."""
+    days = (moment - start).days
+    if rule['freq'] == 'DAILY':
+        return max(0, days // rule['interval'])
+    if rule['freq'] == 'WEEKLY':
+        return max(0, days // 7 // rule['interval'] - 1)
+    months = (moment.year - start.year) * 12 + moment.month - start.month
+    return max(0, months // rule['interval'] - 1)
+
+
+def period_occurrences(start, rule, period):
+    step = period * rule['interval']
+    if rule['freq'] == 'DAILY':
+        return [start + timedelta(days=step)]
+    if rule['freq'] == 'WEEKLY':
+        if not rule['byday']:
+            return [start + timedelta(weeks=step)]
+        week = start - timedelta(days=start.weekday()) + timedelta(weeks=step)
+        return [week + timedelta(days=day) for day in rule['byday']]
+    year, month = month_offset(start, step)
+    if start.day > calendar.monthrange(year, month)[1]:
+        return []
+    return [start.replace(year=year, month=month)]
+
+
+def iter_occurrences(start, rule, after=None, before=None):
+    """
+    Yield occurrence datetimes of a series beginning at ``start``, in order,
+    limited to ``after <= occurrence < before`` when those are given. Without
+    COUNT, whole periods before ``after`` are skipped arithmetically, so
+    reading a window far in the future doesn't walk the series from its start.
+    """
+    if isinstance(rule, str):
+        rule = parse_rrule(rule)
+    period = 0
+    if rule['count'] is None and after is not None and after > start:
+        period = periods_before(start, after, rule)
+
+    emitted = 0
+    while True:
+        try:
+            occurrences = period_occurrences(start, rule, period)
+        except (OverflowError, ValueError):
+            # Ran off the end of the calendar (year 9999)
+            return
+        for occurrence in occurrences:
+            if occurrence < start:
+                continue
+            if rule['until'] is not None and occurrence > rule['until']:
+                return
+            if rule['count'] is not None:
+                if emitted >= rule['count']:
+                    return
+                emitted += 1
+            if before is not None and occurrence >= before:
+                return
+            if after is None or occurrence >= after:
+                yield occurrence
+        period += 1
+
+
+def last_occurrence(start, rule):
+    """
+    The final occurrence of a bounded series, or None if it never ends.
+    COUNT series are walked (at most MAX_COUNT dates); UNTIL series are only
+    read in a window just before UNTIL, widened while it turns up nothing.
+    """
+    if isinstance(rule, str):
+        rule = parse_rrule(rule)
+    if rule['count'] is None and rule['until'] is None:
+        return None
+    last = None
+    if rule['count'] is not None:
+        for last in iter_occurrences(start, rule):
+            pass
+        return last
+
+    window = timedelta(days=PERIOD_DAYS[rule['freq']] * rule['interval'])
+    while last is None:
+        after = rule['until'] - window
+        for last in iter_occurrences(start, rule, after=after):
+            pass
+        if after <= start:
+            return last
+        window *= 2
+    return last
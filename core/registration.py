@@ -0,0 +1,48 @@
+"""
+One signup pipeline shared by the dj-rest-auth registration endpoint and
+/register/: the user row goes in with every field set by a single INSERT,
+then profile, token and organisation membership are inserted alongside it
+in the same transaction.
+"""
+from django.db import transaction
+from rest_framework.authtoken.models import Token
+
+from .models import Organisation, Profile, User
+from .tenancy import current_organisation_id
+
+
+def build_user(username, email, password, first_name='', last_name=''):
+    """An unsaved user with its password already hashed."""
+    user = User(
+        username=username,
+        email=User.objects.normalize_email(email),
+        first_name=first_name or '',
+        last_name=last_name or '',
+    )
+    user.set_password(password)
+    return user
+
+
+def register_user(user, bio=None, profile_picture=None, contact_info=None, after_create=None):
+    """
+    Save a user from ``build_user`` together with its profile and API token.
+    ``after_create(user)`` runs inside the same transaction, for extra rows
+    that have to share its fate (allauth's EmailAddress).
+    """
+    with transaction.atomic():
+        user.save(force_insert=True)
+        # bulk_create: plain INSERTs, skipping Token.save's UPDATE-then-INSERT
+        Profile.objects.bulk_create([Profile(
+            user=user,
+            bio=bio or '',
+            profile_picture=profile_picture or None,
+            contact_info=contact_info or '',
+        )])
+        Token.objects.bulk_create([Token(user=user, key=Token.generate_key())])
+        # Members of the organisation they signed up with
+        Organisation.members.through.objects.bulk_create([Organisation.members.through(
+            organisation_id=current_organisation_id() or Organisation.default_id(), user_id=user.pk,
+        )])
+        if after_create is not None:
+            after_create(user)
+    return user
@@ -1,10 +1,17 @@
 from rest_framework import serializers
-from .models import VolunteerWork, Review,Profile,User,JoinRequest,Category
+from .models import VolunteerWork, Review,Profile,User,JoinRequest,Category,AuditEvent,EventSeries,LeaderboardEntry,RATING_COUNT_FIELDS
+from .recurrence import parse_rrule
+from .registration import build_user, register_user
 from dj_rest_auth.registration.serializers import RegisterSerializer
-from rest_framework.authtoken.models import Token
+from allauth.account.adapter import get_adapter
+from allauth.account.utils import setup_user_email
+from django.core.exceptions import ValidationError as DjangoValidationError
 from django.core.mail import send_mail
 from django.conf import settings
-import requests
+from django.db import transaction
+from django.db.models import Manager, QuerySet
+from contextlib import nullcontext
+from collections import defaultdict
 from rest_framework.exceptions import ValidationError
 import logging
 logger = logging.getLogger(__name__)
@@ -27,33 +34,33 @@ class CustomRegisterSerializer(RegisterSerializer):
         return data
 
     def save(self, request):
+        adapter = get_adapter()
+        self.cleaned_data = self.get_cleaned_data()
+        data = self.cleaned_data
+        user = build_user(
+            data['username'], data['email'], data['password1'],
+            first_name=data['first_name'], last_name=data['last_name'],
+        )
+        # Same check allauth runs on save: password vs. the user's own attributes
+        try:
+            adapter.clean_password(data['password1'], user=user)
+        except DjangoValidationError as exc:
+            raise ValidationError(detail=serializers.as_serializer_error(exc))
         try:
-            user = super().save(request)
-            user.first_name = self.validated_data.get('first_name', '')
-            user.last_name = self.validated_data.get('last_name', '')
-            user.save()
-
-            profile, created = Profile.objects.get_or_create(
-                user=user,
-                defaults={
-                    "bio": self.validated_data.get('bio', ''),
-                    "contact_info": self.validated_data.get('contact_info', ''),
-                    "profile_picture": self.validated_data.get('profile_picture')
-                }
+            register_user(
+                user,
+                bio=data['bio'],
+                profile_picture=data['profile_picture'],
+                contact_info=data['contact_info'],
+                after_create=lambda user: setup_user_email(request, user, []),
             )
-            print("profile created", profile)
-            profile.save()
-
-            logger.info("Profile creation status: %s", "Created" if created else "Already exists")
-
-            # Token and email
-            Token.objects.create(user=user)
-            send_welcome_email(user.email, user.first_name)
-            return user
         except Exception as e:
             logger.error("Error during registration: %s", str(e))
             raise ValidationError("An error occurred during registration.")
-    
+        # robust: a mail outage is logged instead of failing a signup that already committed
+        transaction.on_commit(lambda: send_welcome_email(user.email, user.first_name), robust=True)
+        return user
+
 
 class UserProfileRegisterSerializer(serializers.ModelSerializer):
     bio = serializers.CharField(required=False, allow_blank=True, allow_null=True)
@@ -74,26 +81,20 @@ class UserProfileRegisterSerializer(serializers.ModelSerializer):
         return attrs
 
     def create(self, validated_data):
-        # Remove password1 and password2 to get the actual password
-        validated_data.pop('password2')
-        user = User.objects.create_user(
-            username=validated_data['username'],
-            email=validated_data['email'],
-            password=validated_data['password1'],  # Use password1 here
-            first_name=validated_data['first_name'],  # Set first name
-            last_name=validated_data['last_name']     # Set last name
+        user = build_user(
+            validated_data['username'],
+            validated_data['email'],
+            validated_data['password1'],
+            first_name=validated_data['first_name'],
+            last_name=validated_data['last_name'],
         )
-
-        # Create profile linked to the user
-        Profile.objects.create(
-            user=user,
-            bio=validated_data.pop('bio', ''),
-            profile_picture=validated_data.pop('profile_picture', None),
-            contact_info=validated_data.pop('contact_info', '')
+        return register_user(
+            user,
+            bio=validated_data.get('bio'),
+            profile_picture=validated_data.get('profile_picture'),
+            contact_info=validated_data.get('contact_info'),
         )
 
-        return user
-
 
 
 class ReviewSerializer(serializers.ModelSerializer):
@@ -107,13 +108,61 @@ class ReviewSerializer(serializers.ModelSerializer):
     def get_rating_display(self, obj):
         return '⭐' * obj.rating
 
+class VolunteerWorkListSerializer(serializers.ListSerializer):
+    """
+    Lists of works given as a queryset are built straight from .values_list()
+    rows (plus one query for participant ids) instead of instantiating a
+    model and running every field per row. The output matches
+    VolunteerWorkSerializer field for field; plain lists take the normal path.
+    """
+    date_field = serializers.DateTimeField()
+    duration_field = serializers.DurationField()
+
+    def to_representation(self, data):
+        if isinstance(data, Manager):
+            data = data.all()
+        if not isinstance(data, QuerySet):
+            return super().to_representation(data)
+
+        columns = ['id', 'title', 'description', 'location', 'date', 'organizer__username', 'category_id', 'image_url', 'duration']
+        rows = list(data.prefetch_related(None).values_list(*columns, *RATING_COUNT_FIELDS.values()))
+        participants = defaultdict(list)
+        through = VolunteerWork.participants.through
+        for work_id, user_id in (
+            through.objects.filter(volunteerwork_id__in=[row[0] for row in rows])
+            .order_by('pk').values_list('volunteerwork_id', 'user_id')
+        ):
+            participants[work_id].append(user_id)
+
+        date = self.date_field.to_representation
+        duration = self.duration_field.to_representation
+        result = []
+        for pk, title, description, location, when, organizer, category, image_url, length, *counts in rows:
+            total = sum(counts)
+            result.append({
+                'id': pk,
+                'title': title,
+                'description': description,
+                'location': location,
+                'date': date(when) if when else None,
+                'organizer': organizer,
+                'participants': participants[pk],
+                'category': category,
+                'average_rating': sum(stars * n for stars, n in enumerate(counts, start=1)) / total if total else 0,
+                'image_url': image_url,
+                'duration': duration(length) if length is not None else None,
+            })
+        return result
+
+
 class VolunteerWorkSerializer(serializers.ModelSerializer):
     organizer = serializers.StringRelatedField(read_only=True)
     average_rating = serializers.SerializerMethodField()
 
     class Meta:
         model = VolunteerWork
-        fields = ['id', 'title', 'description', 'location', 'date', 'organizer', 'participants', 'category', 'average_rating','image_url']
+        fields = ['id', 'title', 'description', 'location', 'date', 'organizer', 'participants', 'category', 'average_rating','image_url', 'duration']
+        list_serializer_class = VolunteerWorkListSerializer
 
     def get_average_rating(self, obj):
         return obj.average_rating()
@@ -139,10 +188,79 @@ class CustomUserSerializer(serializers.ModelSerializer):
         model = User
         fields = ['id', 'username', 'email', 'first_name', 'last_name', 'profile']
 
+class UserEditSerializer(serializers.ModelSerializer):
+    """
+    Partial update of a user and their profile. Only columns whose value
+    actually changes are written, and a transaction is opened only when both
+    rows need a write. Expects the user loaded with select_related('profile').
+    """
+    bio = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    profile_picture = serializers.URLField(required=False, allow_blank=True, allow_null=True)
+    contact_info = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+
+    user_fields = ['username', 'email', 'first_name', 'last_name']
+    profile_fields = ['bio', 'profile_picture', 'contact_info']
+
+    class Meta:
+        model = User
+        fields = ['username', 'email', 'first_name', 'last_name', 'bio', 'profile_picture', 'contact_info']
+
+    @staticmethod
+    def get_profile(user):
+        try:
+            return user.profile
+        except Profile.DoesNotExist:
+            return None
+
+    def update(self, user, validated_data):
+        profile = self.get_profile(user)
+        created = profile is None
+        if created:
+            profile = Profile(user=user)
+
+        changed_user = [f for f in self.user_fields if f in validated_data and getattr(user, f) != validated_data[f]]
+        changed_profile = [f for f in self.profile_fields if f in validated_data and getattr(profile, f) != validated_data[f]]
+        for field in changed_user:
+            setattr(user, field, validated_data[field])
+        for field in changed_profile:
+            setattr(profile, field, validated_data[field])
+
+        writes = bool(changed_user) + bool(changed_profile or created)
+        with transaction.atomic() if writes > 1 else nullcontext():
+            if changed_user:
+                user.save(update_fields=changed_user)
+            if created:
+                profile.save()
+            elif changed_profile:
+                # updated_at feeds the user detail ETag
+                profile.save(update_fields=changed_profile + ['updated_at'])
+        user.profile = profile
+        return user
+
+    def to_representation(self, user):
+        profile = self.get_profile(user)
+        return {
+            'id': user.id,
+            'username': user.username,
+            'email': user.email,
+            'first_name': user.first_name,
+            'last_name': user.last_name,
+            'profile': {field: getattr(profile, field, None) for field in self.profile_fields},
+        }
+
+class UserDirectorySerializer(serializers.ModelSerializer):
+    """Public directory entry; unlike CustomUserSerializer it does not expose email."""
+    profile = ProfileSerializer(read_only=True)
+
+    class Meta:
+        model = User
+        fields = ['id', 'username', 'first_name', 'last_name', 'profile']
+
 class JoinRequestSerializer(serializers.ModelSerializer):
     user = serializers.StringRelatedField(read_only=True)
     volunteer_work_title = serializers.CharField(source='volunteer_work.title', read_only=True)
-    volunteer_work = serializers.PrimaryKeyRelatedField(queryset=VolunteerWork.objects.all())
+    # The manager, not .all(): DRF re-evaluates it per request, scoped to the organisation
+    volunteer_work = serializers.PrimaryKeyRelatedField(queryset=VolunteerWork.objects)
 
     class Meta:
         model = JoinRequest
@@ -152,6 +270,55 @@ class CategorySerializer(serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = '__all__'
+        read_only_fields = ['organisation']
+
+    def validate(self, attrs):
+        # Names and slugs are unique per organisation; Category.objects is scoped to it
+        others = Category.objects.exclude(pk=self.instance.pk) if self.instance else Category.objects.all()
+        for field in ('name', 'slug'):
+            if attrs.get(field) and others.filter(**{field: attrs[field]}).exists():
+                raise serializers.ValidationError({field: f"A category with this {field} already exists."})
+        return attrs
+
+class EventSeriesSerializer(serializers.ModelSerializer):
+    organizer = serializers.StringRelatedField(read_only=True)
+
+    class Meta:
+        model = EventSeries
+        fields = ['id', 'title', 'description', 'location', 'start', 'rrule', 'ends_at', 'organizer', 'category', 'image_url']
+        read_only_fields = ['ends_at']
+
+    def validate_rrule(self, value):
+        try:
+            parse_rrule(value)
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
+        return value.upper()
+
+class CheckInScanSerializer(serializers.Serializer):
+    token = serializers.CharField(max_length=255)
+    scanned_at = serializers.DateTimeField()
+    kind = serializers.ChoiceField(choices=['in', 'out'], default='in')
+
+
+class CheckInBatchSerializer(serializers.Serializer):
+    scans = CheckInScanSerializer(many=True, allow_empty=False, max_length=500)
+
+
+class LeaderboardEntrySerializer(serializers.ModelSerializer):
+    username = serializers.CharField(source='user.username', read_only=True)
+
+    class Meta:
+        model = LeaderboardEntry
+        fields = ['rank', 'user', 'username', 'hours']
+
+
+class AuditEventSerializer(serializers.ModelSerializer):
+    actor = serializers.StringRelatedField(read_only=True)
+
+    class Meta:
+        model = AuditEvent
+        fields = ['id', 'occurred_at', 'actor', 'action', 'object_type', 'object_id', 'changes']
 
 
 def send_welcome_email(user_email, first_name):
@@ -0,0 +1,73 @@
+"""
+Change log behind /api/sync/. Saves and deletes of the synced models write
+a ChangeLogEntry once their transaction commits; bulk updates that bypass
+signals log through the helpers in models.py.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Category, ChangeLogEntry, JoinRequest, Review, VolunteerWork
+
+SYNCED_MODELS = (VolunteerWork, Category, Review, JoinRequest)
+
+
+def owner(instance):
+    # Reviews belong to their work's organisation
+    return instance.volunteer_work.organisation_id if isinstance(instance, Review) else instance.organisation_id
+
+
+def audience(instance):
+    # Join requests are private to the volunteer who sent them
+    return instance.user_id if isinstance(instance, JoinRequest) else None
+
+
+def log_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        ChangeLogEntry.record(instance._meta.model_name, owner(instance), [instance.pk], user_id=audience(instance))
+
+
+def log_delete(sender, instance, **kwargs):
+    ChangeLogEntry.record(
+        instance._meta.model_name, owner(instance), [instance.pk], deleted=True, user_id=audience(instance),
+    )
+
+
+# Connected per sender so unrelated models keep the collector's fast delete
+for model in SYNCED_MODELS:
+    post_save.connect(log_save, sender=model)
+    post_delete.connect(log_delete, sender=model)
+
+
+@receiver(pre_delete, sender=Category)
+def log_uncategorised_works(sender, instance, **kwargs):
+    # on_delete=SET_NULL clears work.category with a plain UPDATE
+    ChangeLogEntry.record('volunteerwork', instance.organisation_id, instance.volunteer_works.values_list('pk', flat=True))
+
+
+def changes_since(organisation_id, user, since, limit):
+    """
+    Up to ``limit`` of ``organisation_id``'s entries visible to ``user``
+    after seq ``since``, and whether more are waiting. Entries are written
+    after the change commits, in a transaction of their own, so seqs follow
+    commit order except while two such writes overlap: one can commit a lower
+    seq just after a higher one became visible. Entries younger than
+    SYNC_SETTLE_TIME are therefore held back (with everything after them)
+    until such stragglers have landed.
+    """
+    settled = timezone.now() - getattr(settings, 'SYNC_SETTLE_TIME', timedelta(seconds=2))
+    entries = []
+    queryset = (
+        ChangeLogEntry.objects
+        .filter(Q(user__isnull=True) | Q(user=user), organisation_id=organisation_id, seq__gt=since)
+        .order_by('seq')
+    )
+    for entry in queryset[:limit + 1]:
+        if entry.changed_at > settled:
+            return entries, False
+        entries.append(entry)
+    return entries[:limit], len(entries) > limit
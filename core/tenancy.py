@@ -0,0 +1,122 @@
+"""
+Several organisations (NGOs) share one deployment. TenantMiddleware works
+out which one a request is for and keeps it in a context variable; the
+default managers of tenant-owned models (see TenantModel in models.py) read
+it to scope every query. Outside a request (shell, management commands) no
+organisation is active and those managers see all rows. A host maps to its
+organisation for everyone; picking one with the header takes membership.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import JsonResponse
+from django.utils.cache import patch_vary_headers
+
+HEADER = 'X-Organisation'
+CACHE_TIMEOUT = 5 * 60
+
+_current = ContextVar('current_organisation', default=None)
+
+
+def current_organisation_id():
+    return _current.get()
+
+
+@contextmanager
+def use_organisation(organisation_id):
+    """Scope the tenant managers to ``organisation_id`` for the block (None lifts the scope)."""
+    token = _current.set(organisation_id)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def tenant_cache_key(key, organisation_id=None):
+    """Prefix ``key`` with an organisation so tenants never read each other's cache entries."""
+    if organisation_id is None:
+        organisation_id = current_organisation_id()
+    return f'org{organisation_id}:{key}'
+
+
+def header_user_id(request):
+    """
+    The user a request authenticates as, for the membership check. DRF
+    authenticates later, in the view, so API tokens are looked up here.
+    """
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return user.pk
+    keyword, _, key = request.headers.get('Authorization', '').partition(' ')
+    if keyword == 'Token' and key:
+        from rest_framework.authtoken.models import Token
+        return Token.objects.filter(key=key.strip()).values_list('user_id', flat=True).first()
+    return None
+
+
+def member_cache_key(organisation_id, user_id):
+    return f'organisation:{organisation_id}:member:{user_id}'
+
+
+def is_member(user_id, organisation_id):
+    from .models import Organisation
+
+    key = member_cache_key(organisation_id, user_id)
+    member = cache.get(key)
+    if member is None:
+        member = Organisation.members.through.objects.filter(organisation_id=organisation_id, user_id=user_id).exists()
+        cache.set(key, member, CACHE_TIMEOUT)
+    return member
+
+
+def resolve_organisation_id(request):
+    """
+    The organisation a request is for: the slug in the X-Organisation header,
+    else the one whose domain is the request host, else DEFAULT_ORGANISATION.
+    Lookups are cached; None means an unknown slug.
+    """
+    from .models import Organisation
+
+    slug = request.headers.get(HEADER)
+    if slug:
+        lookup = {'slug': slug}
+    else:
+        host = request.get_host().partition(':')[0].lower()
+        lookup = {'domain': host}
+
+    key = 'organisation:' + ':'.join(f'{name}={value}' for name, value in lookup.items())
+    organisation_id = cache.get(key)
+    if organisation_id is None:
+        organisation_id = Organisation.objects.filter(**lookup).values_list('pk', flat=True).first()
+        if organisation_id is None and not slug:
+            organisation_id = Organisation.default_id()
+        if organisation_id is not None:
+            cache.set(key, organisation_id, CACHE_TIMEOUT)
+    return organisation_id
+
+
+class TenantMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        organisation_id = resolve_organisation_id(request)
+        if organisation_id is None:
+            return JsonResponse({'detail': 'Unknown organisation.'}, status=404)
+        # The header can name any organisation, so only its members may send it
+        if request.headers.get(HEADER):
+            user_id = header_user_id(request)
+            if user_id is None or not is_member(user_id, organisation_id):
+                return JsonResponse({'detail': 'You are not a member of this organisation.'}, status=403)
+        request.organisation_id = organisation_id
+        with use_organisation(organisation_id):
+            response = self.get_response(request)
+        # Same URL, different organisation, different body
+        patch_vary_headers(response, (HEADER,))
+        return response
+
+
+def default_organisation_slug():
+    return getattr(settings, 'DEFAULT_ORGANISATION', 'default')
@@ -1,3 +1,975 @@
-from django.test import TestCase
+import os
+import socket
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from importlib.util import find_spec
+from io import BytesIO, StringIO
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.request import Request
+from rest_framework.test import APIClient
+
+from . import images, recommendations, throttling
+from .audit import AuditMiddleware
+from .checkin import make_token
+from .hashers import ConfigurablePBKDF2PasswordHasher
+from .hours import ALL_TIME, GLOBAL_BOARD, complete_work, refresh_leaderboards
+from .management.commands.verify_image_links import probe
+from .models import (
+    Attendance, AuditEvent, Category, ChangeLogEntry, EventSeries, HoursLedgerEntry, IdempotencyKey, JoinRequest,
+    LeaderboardEntry, Organisation, RecommendationBuild, Review, VolunteerHours, VolunteerWork, WorkSimilarity,
+)
+from .pagination import StableOrderingFilter
+from .recommendations import recommended_work_ids
+from .tenancy import use_organisation
+from .views import ReviewViewSet
+
+
+def make_work(organizer, **fields):
+    fields.setdefault('organisation', Organisation.objects.get(pk=Organisation.default_id()))
+    fields.setdefault('date', timezone.now())
+    fields.setdefault('title', 'Beach clean')
+    return VolunteerWork.objects.create(description='Bring gloves', location='Pier', organizer=organizer, **fields)
+
+
+class CheckInTests(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user('organizer', password='x')
+        self.volunteer = User.objects.create_user('volunteer', password='x')
+        self.work = make_work(self.organizer, duration=timedelta(hours=2))
+        self.work.participants.add(self.volunteer)
+        self.token = make_token(self.work.pk, self.volunteer.pk)
+        self.client = APIClient()
+        self.client.force_authenticate(self.organizer)
+        self.start = timezone.now().replace(microsecond=0)
+
+    def post(self, *scans):
+        return self.client.post(f'/api/volunteer-work/{self.work.pk}/checkins/', {'scans': [
+            {'token': self.token, 'kind': kind, 'scanned_at': (self.start + timedelta(hours=offset)).isoformat()}
+            for kind, offset in scans
+        ]}, format='json')
+
+    def attendance(self):
+        row = Attendance.objects.get(volunteer_work=self.work, user=self.volunteer)
+        return row.checked_in_at, row.checked_out_at
+
+    def test_check_in_after_check_out_is_kept(self):
+        self.post(('out', 4))
+        self.post(('in', 0))
+        self.assertEqual(self.attendance(), (self.start, self.start + timedelta(hours=4)))
+
+    def test_replayed_older_batch_does_not_move_times(self):
+        self.post(('in', 0), ('out', 3))
+        self.post(('in', 1), ('out', 4))
+        self.post(('in', 0), ('out', 3))
+        self.assertEqual(self.attendance(), (self.start, self.start + timedelta(hours=4)))
+
+    def test_replay_is_a_no_op(self):
+        for _ in range(2):
+            response = self.post(('in', 0), ('out', 2))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data['accepted'], 2)
+        self.assertEqual(Attendance.objects.count(), 1)
+        self.assertEqual(self.attendance(), (self.start, self.start + timedelta(hours=2)))
+
+    def test_bad_token_rejected_without_failing_batch(self):
+        response = self.client.post(f'/api/volunteer-work/{self.work.pk}/checkins/', {'scans': [
+            {'token': self.token + 'x', 'scanned_at': self.start.isoformat()},
+            {'token': make_token(self.work.pk + 1, self.volunteer.pk), 'scanned_at': self.start.isoformat()},
+            {'token': self.token, 'scanned_at': self.start.isoformat()},
+        ]}, format='json')
+        self.assertEqual(response.data['accepted'], 1)
+        self.assertEqual([row['index'] for row in response.data['rejected']], [0, 1])
+
+    def test_only_organizer_records_scans(self):
+        self.client.force_authenticate(self.volunteer)
+        self.assertEqual(self.post(('in', 0)).status_code, 403)
+
+
+class ArchiveTests(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user('organizer', password='x')
+        self.volunteer = User.objects.create_user('volunteer', password='x')
+        self.old = make_work(self.organizer, title='Old', date=timezone.now() - settings.ARCHIVE_AFTER - timedelta(days=1))
+        self.recent = make_work(self.organizer, title='Recent', date=timezone.now() - timedelta(days=1))
+        for work in (self.old, self.recent):
+            JoinRequest.objects.create(volunteer_work=work, user=self.volunteer)
+        self.client = APIClient()
+        self.client.force_authenticate(self.organizer)
+
+    def archive(self):
+        out = StringIO()
+        call_command('archive_past_works', stdout=out)
+        return out.getvalue()
+
+    def test_archives_old_works_and_their_join_requests(self):
+        self.assertIn('Archived 1 volunteer works and 1 join requests', self.archive())
+        self.assertEqual(list(VolunteerWork.objects.filter(archived=True).values_list('title', flat=True)), ['Old'])
+        self.assertEqual(list(JoinRequest.objects.filter(archived=True).values_list('volunteer_work', flat=True)), [self.old.pk])
+        self.assertIn('Archived 0 volunteer works and 0 join requests', self.archive())
+
+    def test_archiving_changes_the_validators(self):
+        updated_at = self.old.updated_at
+        self.archive()
+        self.old.refresh_from_db()
+        self.assertGreater(self.old.updated_at, updated_at)
+
+    def titles(self, **params):
+        return sorted(work['title'] for work in self.client.get('/api/volunteer-work/', params).data)
+
+    def test_listings_hide_archived_rows_unless_asked(self):
+        self.archive()
+        self.assertEqual(self.titles(), ['Recent'])
+        self.assertEqual(self.titles(include_past='true'), ['Old', 'Recent'])
+        self.assertEqual(len(self.client.get('/api/join-requests/').data), 1)
+        self.assertEqual(len(self.client.get('/api/join-requests/', {'include_past': '1'}).data), 2)
+        # Detail routes still reach archived work
+        self.assertEqual(self.client.get(f'/api/volunteer-work/{self.old.pk}/').status_code, 200)
+
+
+class UserEditTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('volunteer', password='x', first_name='Vee')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.client.patch('/api/auth/user/edit/', {'bio': 'Hi', 'profile_picture': 'https://example.org/me.png'})
+
+    def patch(self, data):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch('/api/auth/user/edit/', data)
+        self.assertEqual(response.status_code, 200)
+        return response, [query['sql'] for query in queries if query['sql'].startswith('UPDATE')]
+
+    def test_only_changed_profile_columns_are_written(self):
+        response, updates = self.patch({'bio': 'Hello'})
+        self.assertEqual(response.data['profile']['bio'], 'Hello')
+        self.assertEqual(len(updates), 1)
+        self.assertIn('core_profile', updates[0])
+        self.assertIn('"bio"', updates[0])
+        self.assertNotIn('"contact_info"', updates[0])
+
+    def test_unchanged_values_write_nothing(self):
+        _, updates = self.patch({'bio': 'Hi', 'first_name': 'Vee'})
+        self.assertEqual(updates, [])
+
+    def test_user_and_profile_change_together(self):
+        response, updates = self.patch({'first_name': 'Val', 'contact_info': 'val@example.org'})
+        self.assertEqual(len(updates), 2)
+        self.assertEqual((response.data['first_name'], response.data['profile']['contact_info']), ('Val', 'val@example.org'))
+        self.assertEqual(response.data['profile']['bio'], 'Hi')
+
+    def test_put_keeps_the_picture_when_left_empty(self):
+        response = self.client.put('/api/auth/user/edit/', {'bio': 'Put', 'profile_picture': ''})
+        self.assertEqual(response.data['profile']['profile_picture'], 'https://example.org/me.png')
+        response = self.client.patch('/api/auth/user/edit/', {'profile_picture': ''})
+        self.assertEqual(response.data['profile']['profile_picture'], '')
+
+
+class OrganizerAnalyticsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.organizer = User.objects.create_user('organizer', password='x')
+        self.users = {name: User.objects.create_user(name, password='x') for name in ('u1', 'u2', 'u3', 'u4', 'u5')}
+        january = timezone.make_aware(datetime(2026, 1, 15, 12))
+        february = timezone.make_aware(datetime(2026, 2, 15, 12))
+        self.january = make_work(self.organizer, title='January', date=january)
+        self.february = make_work(self.organizer, title='February', date=february)
+        self.january.participants.add(self.users['u1'], self.users['u2'])
+        self.february.participants.add(self.users['u1'], self.users['u3'])
+
+        for work, name, rating, created_at in (
+            (self.january, 'u1', 4, january), (self.january, 'u2', 2, january), (self.february, 'u1', 5, february),
+        ):
+            review = Review.objects.create(volunteer_work=work, user=self.users[name], rating=rating)
+            Review.objects.filter(pk=review.pk).update(created_at=created_at)
+        for name, status in (('u3', 'approved'), ('u4', 'pending'), ('u5', 'rejected')):
+            request = JoinRequest.objects.create(volunteer_work=self.february, user=self.users[name], status=status)
+            JoinRequest.objects.filter(pk=request.pk).update(
+                created_at=february, decided_at=february + timedelta(hours=2) if status != 'pending' else None,
+            )
+        self.client = APIClient()
+        self.client.force_authenticate(self.organizer)
+
+    def report(self):
+        return self.client.get('/api/analytics/').data
+
+    def test_totals(self):
+        self.assertEqual(self.report()['totals'], {
+            'events': 2,
+            'requests': {'pending': 1, 'approved': 1, 'rejected': 1},
+            'approval_latency_hours': 2.0,
+            'participants': 3,
+            'returning_participants': 1,
+            'reviews': 3,
+            'average_rating': 3.67,
+        })
+
+    def test_months_track_retention_and_rating_trend(self):
+        january, february = self.report()['months']
+        self.assertEqual((january['month'], february['month']), ('2026-01', '2026-02'))
+        self.assertEqual(
+            [(month['participants'], month['new_participants'], month['returning_participants']) for month in (january, february)],
+            [(2, 2, 0), (2, 1, 1)],
+        )
+        self.assertEqual(
+            [(month['reviews'], month['average_rating'], month['rating_change']) for month in (january, february)],
+            [(2, 3.0, None), (1, 5.0, 2.0)],
+        )
+        self.assertEqual(february['requests'], {'pending': 1, 'approved': 1, 'rejected': 1})
+
+    def test_report_is_cached_until_something_it_counts_changes(self):
+        self.report()
+        # Bypasses the signals, so the cached report stands
+        JoinRequest.objects.filter(user=self.users['u4']).update(status='rejected')
+        self.assertEqual(self.report()['totals']['requests']['pending'], 1)
+
+        approval = JoinRequest.objects.get(user=self.users['u5'])
+        approval.status = 'approved'
+        approval.save()
+        self.assertEqual(self.report()['totals']['requests'], {'pending': 0, 'approved': 2, 'rejected': 1})
+
+        Review.objects.create(volunteer_work=self.february, user=self.users['u3'], rating=1)
+        self.assertEqual(self.report()['totals']['reviews'], 4)
+
+        self.january.participants.add(self.users['u4'])
+        self.assertEqual(self.report()['totals']['participants'], 4)
+
+
+class HoursTests(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user('organizer', password='x')
+        self.on_time, self.skewed = (User.objects.create_user(name, password='x') for name in ('on-time', 'skewed'))
+        start = timezone.now() - timedelta(days=1)
+        self.work = make_work(self.organizer, date=start, duration=timedelta(hours=3))
+        self.work.participants.add(self.on_time, self.skewed)
+        Attendance.objects.create(
+            volunteer_work=self.work, user=self.on_time, scanned_by=self.organizer,
+            checked_in_at=start, checked_out_at=start + timedelta(hours=2),
+        )
+        # The door scanner's clock ran ahead of the one at the exit
+        Attendance.objects.create(
+            volunteer_work=self.work, user=self.skewed, scanned_by=self.organizer,
+            checked_in_at=start + timedelta(hours=1), checked_out_at=start + timedelta(minutes=30),
+        )
+
+    def test_check_out_before_check_in_is_not_credited(self):
+        with self.assertLogs('core.hours', 'WARNING'):
+            self.assertEqual(complete_work(self.work), 1)
+        self.assertEqual(
+            list(HoursLedgerEntry.objects.values_list('user__username', 'hours')), [('on-time', Decimal('2.00'))],
+        )
+        self.assertFalse(VolunteerHours.objects.filter(user=self.skewed, hours__lt=0).exists())
+
+
+class LeaderboardTests(TestCase):
+    def setUp(self):
+        self.organisation = Organisation.objects.get(pk=Organisation.default_id())
+        self.users = {name: User.objects.create_user(name, password='x') for name in 'abcd'}
+        self.worked_at = timezone.now()
+
+    def credit(self, **hours):
+        HoursLedgerEntry.objects.bulk_create([
+            HoursLedgerEntry(organisation=self.organisation, user=self.users[name], worked_at=self.worked_at, hours=amount)
+            for name, amount in hours.items()
+        ])
+        refresh_leaderboards()
+
+    def board(self, period=ALL_TIME):
+        entries = LeaderboardEntry.objects.filter(board=GLOBAL_BOARD, period=period)
+        ranks = {entry.user.username: (entry.hours, entry.rank) for entry in entries}
+        # Whatever the refresh touched, ranks must match a ranking from scratch
+        for name, (hours, rank) in ranks.items():
+            self.assertEqual(rank, 1 + sum(other > hours for other, _ in ranks.values()), name)
+        return ranks
+
+    def test_ties_share_a_rank(self):
+        self.credit(a=2, b=2, c=1)
+        self.assertEqual(self.board(), {'a': (2, 1), 'b': (2, 1), 'c': (1, 3)})
+
+    def test_passing_another_user(self):
+        self.credit(a=3, b=2, c=1)
+        self.credit(c=3)
+        self.assertEqual(self.board(), {'c': (4, 1), 'a': (3, 2), 'b': (2, 3)})
+
+    def test_several_pending_users_on_one_board(self):
+        self.credit(a=5, b=4, c=3, d=1)
+        # Folded in one refresh: one user jumps to the top, one into a tie
+        HoursLedgerEntry.objects.bulk_create([
+            HoursLedgerEntry(organisation=self.organisation, user=self.users['d'], worked_at=self.worked_at, hours=6),
+            HoursLedgerEntry(organisation=self.organisation, user=self.users['c'], worked_at=self.worked_at, hours=1),
+        ])
+        # Two rows, each on the all-time, yearly and monthly global boards
+        self.assertEqual(refresh_leaderboards(), (2, 3))
+        self.assertEqual(self.board(), {'d': (7, 1), 'a': (5, 2), 'b': (4, 3), 'c': (4, 3)})
+        self.assertEqual(self.board(timezone.localtime(self.worked_at).strftime('%Y')), self.board())
+
+
+@override_settings(ALLOWED_HOSTS=['testserver', 'other.example.org'])
+class TenantIsolationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.default = Organisation.objects.get(pk=Organisation.default_id())
+        self.other = Organisation.objects.create(name='Other', slug='other', domain='other.example.org')
+        self.user = User.objects.create_user('member', password='x')
+        self.default.members.add(self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + Token.objects.create(user=self.user).key)
+        # The sync log is written on commit
+        with self.captureOnCommitCallbacks(execute=True):
+            self.own_work = make_work(self.user, organisation=self.default)
+            self.other_work = make_work(self.user, organisation=self.other, date=timezone.now() + timedelta(days=3))
+            Review.objects.create(volunteer_work=self.own_work, user=self.user, rating=5, comment='ours')
+            Review.objects.create(volunteer_work=self.other_work, user=self.user, rating=1, comment='theirs')
+
+    def test_reviews_are_scoped_to_the_organisation(self):
+        response = self.client.get('/api/reviews/')
+        self.assertEqual([review['comment'] for review in response.data['results']], ['ours'])
+        response = self.client.get('/api/reviews/', HTTP_HOST='other.example.org')
+        self.assertEqual([review['comment'] for review in response.data['results']], ['theirs'])
+
+    @override_settings(SYNC_SETTLE_TIME=timedelta(0))
+    def test_sync_only_returns_own_reviews(self):
+        response = self.client.get('/api/sync/')
+        self.assertEqual([review['comment'] for review in response.data['review']['changed']], ['ours'])
+
+    @override_settings(SYNC_SETTLE_TIME=timedelta(0))
+    def test_sync_only_pages_through_own_log(self):
+        since = self.client.get('/api/sync/').data['next']
+        deleted_id = self.other_work.pk
+        with self.captureOnCommitCallbacks(execute=True):
+            self.other_work.delete()
+        self.assertEqual(self.client.get('/api/sync/', {'since': since}).data, {'next': since, 'has_more': False})
+        response = self.client.get('/api/sync/', HTTP_HOST='other.example.org')
+        self.assertEqual(response.data['volunteerwork']['deleted'], [deleted_id])
+
+    def test_event_series_are_scoped_to_the_organisation(self):
+        with use_organisation(self.other.pk):
+            EventSeries.objects.create(
+                title='Weekly', description='d', location='l', start=timezone.now(), rrule='FREQ=WEEKLY', organizer=self.user,
+            )
+        self.assertEqual(self.client.get('/api/series/').data, [])
+        self.assertEqual(self.client.get('/api/series/occurrences/').data, [])
+        self.assertEqual(len(self.client.get('/api/series/', HTTP_HOST='other.example.org').data), 1)
+
+    def test_categories_are_scoped_to_the_organisation(self):
+        with use_organisation(self.other.pk):
+            Category.objects.create(name='Theirs', slug='theirs')
+        self.assertEqual(self.client.get('/api/category-list/').data, [])
+
+    def test_recommendations_are_cached_per_organisation(self):
+        viewer = User.objects.create_user('viewer', password='x')
+        with use_organisation(self.default.pk):
+            self.assertEqual(recommended_work_ids(viewer), [])
+        with use_organisation(self.other.pk):
+            self.assertEqual(recommended_work_ids(viewer), [self.other_work.pk])
+
+    def test_header_needs_membership(self):
+        self.assertEqual(self.client.get('/api/volunteer-work/', HTTP_X_ORGANISATION='other').status_code, 403)
+        self.assertEqual(APIClient().get('/api/volunteer-work/', HTTP_X_ORGANISATION='other').status_code, 403)
+        self.other.members.add(self.user)
+        response = self.client.get('/api/volunteer-work/', HTTP_X_ORGANISATION='other')
+        self.assertEqual([work['id'] for work in response.data], [self.other_work.pk])
+        self.other.members.remove(self.user)
+        self.assertEqual(self.client.get('/api/volunteer-work/', HTTP_X_ORGANISATION='other').status_code, 403)
+
+
+class TenantAdminTests(TestCase):
+    def setUp(self):
+        self.staff = User.objects.create_superuser('staff', password='x')
+        self.client.force_login(self.staff)
+        self.other = Organisation.objects.create(name='Other', slug='other')
+        make_work(self.staff, title='Ours')
+        make_work(self.staff, title='Theirs', organisation=self.other)
+
+    def titles(self, response):
+        return sorted(work.title for work in response.context['cl'].result_list)
+
+    def test_changelist_shows_every_organisation(self):
+        response = self.client.get('/admin/core/volunteerwork/')
+        self.assertEqual(self.titles(response), ['Ours', 'Theirs'])
+        response = self.client.get('/admin/core/volunteerwork/', {'organisation__id__exact': self.other.pk})
+        self.assertEqual(self.titles(response), ['Theirs'])
+
+    def test_unfiltered_changelist_can_use_the_estimate(self):
+        with use_organisation(self.other.pk):
+            for model in (VolunteerWork, Review, JoinRequest, Category):
+                self.assertFalse(admin.site._registry[model].get_queryset(None).query.where, model)
+
+
+def throttle_rates(**rates):
+    return override_settings(REST_FRAMEWORK={
+        **settings.REST_FRAMEWORK,
+        'DEFAULT_THROTTLE_RATES': {**settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'], **rates},
+    })
+
+
+class ThrottleTests(TestCase):
+    url = '/api/volunteer-work/'
+
+    def setUp(self):
+        throttling._store = None
+        self.addCleanup(setattr, throttling, '_store', None)
+
+    def get(self, ip='203.0.113.7', spoofed=None):
+        forwarded = f'{spoofed}, {ip}' if spoofed else ip
+        return self.client.get(self.url, HTTP_X_FORWARDED_FOR=forwarded)
+
+    @throttle_rates(**{'volunteer-work.anon': '5/min'})
+    def test_spoofed_forwarded_for_shares_the_bucket(self):
+        codes = [self.get(spoofed=f'198.51.100.{i}').status_code for i in range(8)]
+        self.assertEqual(codes, [200] * 5 + [429] * 3)
+        self.assertEqual(self.get(ip='203.0.113.8').status_code, 200)
+
+    @throttle_rates(**{'volunteer-work.anon': '2/min'})
+    def test_rate_limit_and_retry_after_headers(self):
+        first = self.get()
+        self.assertEqual(first['RateLimit-Limit'], '2')
+        self.assertEqual(first['RateLimit-Remaining'], '1')
+        self.assertEqual(first['RateLimit-Policy'], '2;w=60')
+        self.get()
+        refused = self.get()
+        self.assertEqual(refused.status_code, 429)
+        self.assertEqual(refused['RateLimit-Remaining'], '0')
+        self.assertEqual(refused['Retry-After'], '30')
+
+
+@skipUnless(find_spec('fakeredis') and find_spec('lupa'), "needs fakeredis[lua]")
+class RedisBucketStoreTests(TestCase):
+    def setUp(self):
+        import fakeredis
+
+        self.store = throttling.RedisBucketStore(client=fakeredis.FakeRedis())
+        throttling._store = self.store
+        self.addCleanup(setattr, throttling, '_store', None)
+
+    def test_bucket_empties_and_refills(self):
+        results = [self.store.consume('k', 3, 3 / 60, 1000.0) for _ in range(4)]
+        self.assertEqual([allowed for allowed, _, _ in results], [True, True, True, False])
+        self.assertEqual(results[-1][1:], (0, 20.0))
+        self.assertEqual(self.store.consume('k', 3, 3 / 60, 1020.0)[:2], (True, 0))
+        self.assertFalse(self.store.consume('k', 3, 3 / 60, 1020.0)[0])
+
+    def test_buckets_are_per_key(self):
+        self.store.consume('a', 1, 1 / 60, 1000.0)
+        self.assertFalse(self.store.consume('a', 1, 1 / 60, 1000.0)[0])
+        self.assertTrue(self.store.consume('b', 1, 1 / 60, 1000.0)[0])
+
+    @throttle_rates(**{'volunteer-work.anon': '1/min'})
+    def test_api_is_throttled_through_redis(self):
+        self.assertEqual(self.client.get('/api/volunteer-work/').status_code, 200)
+        refused = self.client.get('/api/volunteer-work/')
+        self.assertEqual(refused.status_code, 429)
+        self.assertEqual(refused['Retry-After'], '60')
+        self.assertEqual(refused['RateLimit-Remaining'], '0')
+
+
+class EventSeriesTests(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user('organizer', password='x')
+        self.client = APIClient()
+        self.client.force_authenticate(self.organizer)
+
+    def create(self, rrule):
+        return self.client.post('/api/series/', {
+            'title': 'Park run', 'description': 'd', 'location': 'l', 'start': '2026-01-04T09:00:00Z', 'rrule': rrule,
+        }, format='json')
+
+    def test_until_is_capped(self):
+        response = self.create('FREQ=WEEKLY;BYDAY=SU;UNTIL=99991231')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('rrule', response.data)
+
+    def test_end_of_long_series_is_found_without_expanding_it(self):
+        response = self.create('FREQ=DAILY;UNTIL=20991231')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['ends_at'], '2099-12-30T09:00:00Z')
+
+    def test_window_at_the_end_of_the_calendar(self):
+        series = self.create('FREQ=DAILY').data['id']
+        self.assertEqual(self.client.get(f'/api/series/{series}/occurrences/?start=9999-12-01').status_code, 400)
+        response = self.client.get(f'/api/series/{series}/occurrences/?start=9999-12-30&end=9999-12-31T23:00:00Z')
+        self.assertEqual(len(response.data), 2)
+
+    def test_only_the_organizer_edits_a_series(self):
+        series = self.create('FREQ=WEEKLY').data['id']
+        self.assertEqual(self.client.patch(f'/api/series/{series}/', {'title': 'Park walk'}, format='json').status_code, 200)
+        self.client.force_authenticate(User.objects.create_user('someone', password='x'))
+        self.assertEqual(self.client.patch(f'/api/series/{series}/', {'title': 'Mine'}, format='json').status_code, 403)
+        self.assertEqual(self.client.delete(f'/api/series/{series}/').status_code, 403)
+
+
+class AuditTests(TransactionTestCase):
+    # Events are queued from on_commit callbacks, so commits have to be real
+
+    def setUp(self):
+        cache.clear()
+        self.staff = User.objects.create_superuser('staff', password='x')
+        self.work = make_work(self.staff)
+        AuditEvent.objects.all().delete()
+
+    def run_request(self, view):
+        request = RequestFactory().post('/')
+        request.user = self.staff
+        with CaptureQueriesContext(connection) as queries:
+            AuditMiddleware(view)(request)
+        return [query['sql'] for query in queries if 'INSERT INTO "core_auditevent"' in query['sql']]
+
+    def test_request_events_are_flushed_in_one_insert(self):
+        def view(request):
+            for name in ('a', 'b', 'c'):
+                Review.objects.create(volunteer_work=self.work, user=User.objects.create_user(name), rating=4)
+            self.work.title = 'Renamed'
+            self.work.save()
+
+        self.assertEqual(len(self.run_request(view)), 1)
+        self.assertEqual(AuditEvent.objects.count(), 4)
+        self.assertEqual(set(AuditEvent.objects.values_list('actor', flat=True)), {self.staff.pk})
+
+    def test_rolled_back_changes_leave_no_events(self):
+        def view(request):
+            try:
+                with transaction.atomic():
+                    self.work.title = 'Never'
+                    self.work.save()
+                    raise ValueError
+            except ValueError:
+                pass
+
+        self.assertEqual(self.run_request(view), [])
+        self.assertFalse(AuditEvent.objects.exists())
+
+    def test_history_pages_through_events_sharing_a_timestamp(self):
+        moment = timezone.now()
+        AuditEvent.objects.bulk_create([
+            AuditEvent(occurred_at=moment, action='update', object_type='volunteerwork', object_id=self.work.pk)
+            for _ in range(120)
+        ])
+        client = APIClient()
+        client.force_authenticate(self.staff)
+        ids, url = [], f'/api/audit/volunteerwork/{self.work.pk}/'
+        while url:
+            page = client.get(url).data
+            ids += [event['id'] for event in page['results']]
+            url = page['next']
+        self.assertEqual(len(ids), 120)
+        self.assertEqual(ids, sorted(set(ids), reverse=True))
+
+
+class FastDeleteTests(TestCase):
+    def test_unaudited_models_delete_in_one_query(self):
+        IdempotencyKey.objects.bulk_create([
+            IdempotencyKey(scope='s', key=str(i), request_fingerprint='f') for i in range(50)
+        ])
+        with CaptureQueriesContext(connection) as queries:
+            IdempotencyKey.objects.all().delete()
+        self.assertEqual(len(queries), 1)
+
+
+class IdempotencyTests(TestCase):
+    def setUp(self):
+        throttling._store = None
+        self.addCleanup(setattr, throttling, '_store', None)
+
+    def register(self, username, key='signup-1', ip='203.0.113.1'):
+        return self.client.post('/api/register/', {
+            'username': username, 'email': f'{username}@example.org', 'password1': 'x7!Kq9#mZ2', 'password2': 'x7!Kq9#mZ2',
+            'first_name': 'A', 'last_name': 'B',
+        }, content_type='application/json', HTTP_IDEMPOTENCY_KEY=key, REMOTE_ADDR=ip)
+
+    def test_retry_replays_the_stored_response(self):
+        first = self.register('alice')
+        self.assertEqual(first.status_code, 201)
+        retry = self.register('alice')
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(User.objects.filter(username='alice').count(), 1)
+
+    def test_same_key_from_different_anonymous_clients(self):
+        self.assertEqual(self.register('alice', ip='203.0.113.1').status_code, 201)
+        second = self.register('bob', ip='203.0.113.2')
+        self.assertEqual(second.status_code, 201)
+        self.assertNotIn('Idempotent-Replayed', second)
+        self.assertTrue(User.objects.filter(username='bob').exists())
+
+    def test_reused_key_with_another_body_is_refused(self):
+        self.register('alice')
+        self.assertEqual(self.register('mallory').status_code, 422)
+
+    def test_fingerprint_is_keyed(self):
+        import hashlib
+        import json
+
+        self.register('alice')
+        body = {
+            'username': 'alice', 'email': 'alice@example.org', 'password1': 'x7!Kq9#mZ2', 'password2': 'x7!Kq9#mZ2',
+            'first_name': 'A', 'last_name': 'B',
+        }
+        plain = hashlib.sha256(json.dumps(['POST', '/api/register/', body], sort_keys=True).encode()).hexdigest()
+        self.assertNotEqual(IdempotencyKey.objects.get().request_fingerprint, plain)
+
+
+@override_settings(SYNC_SETTLE_TIME=timedelta(0), SYNC_BATCH_SIZE=2)
+class SyncCursorTests(TransactionTestCase):
+    # Real commits: the log is written from on_commit callbacks
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('volunteer', password='x')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.works = [make_work(self.user, title=f'Work {i}') for i in range(3)]
+
+    def sync_all(self, since=''):
+        """Follow ``next`` until has_more is off; returns (pages, last token)."""
+        pages = []
+        while True:
+            response = self.client.get('/api/sync/', {'since': since})
+            self.assertEqual(response.status_code, 200)
+            pages.append(response.data)
+            since = response.data['next']
+            if not response.data['has_more']:
+                return pages, since
+
+    def changed_titles(self, pages):
+        return [work['title'] for page in pages for work in page.get('volunteerwork', {}).get('changed', [])]
+
+    def test_pages_cover_every_change_once(self):
+        pages, _ = self.sync_all()
+        self.assertEqual(len(pages), 2)
+        self.assertEqual(self.changed_titles(pages), ['Work 0', 'Work 1', 'Work 2'])
+
+    def test_resuming_from_the_cursor_returns_only_newer_changes(self):
+        _, since = self.sync_all()
+        self.assertEqual(self.sync_all(since)[0][0], {'next': since, 'has_more': False})
+        self.works[1].title = 'Renamed'
+        self.works[1].save()
+        pages, _ = self.sync_all(since)
+        self.assertEqual(self.changed_titles(pages), ['Renamed'])
+
+    def test_deletes_come_through_as_ids(self):
+        _, since = self.sync_all()
+        deleted_id = self.works[0].pk
+        self.works[0].delete()
+        pages, _ = self.sync_all(since)
+        self.assertEqual(pages[0]['volunteerwork'], {'changed': [], 'deleted': [deleted_id]})
+
+    def test_join_requests_only_reach_their_volunteer(self):
+        other = User.objects.create_user('other', password='x')
+        JoinRequest.objects.create(volunteer_work=self.works[0], user=other)
+        pages, _ = self.sync_all()
+        self.assertNotIn('joinrequest', [key for page in pages for key in page])
+
+    @override_settings(SYNC_SETTLE_TIME=timedelta(minutes=5))
+    def test_unsettled_changes_are_held_back(self):
+        ChangeLogEntry.objects.update(changed_at=timezone.now() - timedelta(minutes=10))
+        _, since = self.sync_all()
+        self.works[2].save()
+        page = self.client.get('/api/sync/', {'since': since}).data
+        self.assertEqual(page, {'next': since, 'has_more': False})
+
+    def test_bad_cursor(self):
+        self.assertEqual(self.client.get('/api/sync/', {'since': 'abc'}).status_code, 400)
+
+    def test_changes_are_logged_when_their_transaction_commits(self):
+        _, since = self.sync_all()
+        with transaction.atomic():
+            self.works[0].title = 'Slow'
+            self.works[0].save()
+            # No seq is taken while the transaction is open, so however long
+            # it runs it can't land behind a cursor that moved on meanwhile
+            self.assertFalse(ChangeLogEntry.objects.filter(seq__gt=since).exists())
+        pages, _ = self.sync_all(since)
+        self.assertEqual(self.changed_titles(pages), ['Slow'])
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user('organizer', password='x')
+        self.category = Category.objects.create(name='Beaches', slug='beaches')
+        self.work = make_work(self.organizer, category=self.category)
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('viewer', password='x'))
+
+    def assertRefetched(self, url, change):
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        change()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def rename_organizer(self):
+        self.organizer.username = 'renamed'
+        self.organizer.save()
+
+    def rename_category(self):
+        self.category.name = 'Coasts'
+        self.category.save()
+
+    def test_renaming_the_organizer_changes_the_etag(self):
+        self.assertRefetched('/api/volunteer-work/', self.rename_organizer)
+        self.assertEqual(self.client.get('/api/volunteer-work/').data[0]['organizer'], 'renamed')
+
+    def test_renaming_the_category_changes_the_etag(self):
+        self.assertRefetched('/api/list/beaches/', self.rename_category)
+
+    def test_login_does_not_touch_works(self):
+        updated_at = self.work.updated_at
+        self.organizer.last_login = timezone.now()
+        self.organizer.save(update_fields=['last_login'])
+        self.work.refresh_from_db()
+        self.assertEqual(self.work.updated_at, updated_at)
+
+
+class ReviewOrderingTests(TestCase):
+    def setUp(self):
+        organizer = User.objects.create_user('organizer', password='x')
+        self.work = make_work(organizer)
+        for i in range(5):
+            Review.objects.create(volunteer_work=self.work, user=User.objects.create_user(f'r{i}'), rating=4)
+
+    def pages(self, ordering):
+        ids = []
+        for page in range(1, 6):
+            response = APIClient().get('/api/reviews/', {
+                'volunteer_work': self.work.pk, 'ordering': ordering, 'page_size': 1, 'page': page,
+            })
+            ids += [review['id'] for review in response.data['results']]
+        return ids
+
+    def test_ties_page_through_every_review_once(self):
+        for ordering, descending in (('-rating', True), ('rating', False), ('-created_at', True), ('created_at', False)):
+            ids = self.pages(ordering)
+            self.assertEqual(ids, sorted(ids, reverse=descending), ordering)
+            self.assertEqual(len(set(ids)), 5, ordering)
+
+    def test_tiebreakers_follow_the_requested_direction(self):
+        view = ReviewViewSet()
+        for requested, expected in (
+            ('-rating', ['-rating', '-created_at', '-pk']),
+            ('rating', ['rating', 'created_at', 'pk']),
+            ('created_at', ['created_at', 'pk']),
+            ('', ['-created_at', '-pk']),
+        ):
+            request = Request(RequestFactory().get('/', {'ordering': requested} if requested else {}))
+            self.assertEqual(StableOrderingFilter().get_ordering(request, Review.objects.all(), view), expected)
+
+
+class RecommendationBuildTests(TestCase):
+    def setUp(self):
+        organizer = User.objects.create_user('organizer', password='x')
+        self.users = [User.objects.create_user(f'user{i}', password='x') for i in range(4)]
+        self.works = [make_work(organizer, title=f'Work {i}') for i in range(5)]
+        for user, works in zip(self.users, ([0, 1], [1, 2], [3, 4], [3])):
+            for i in works:
+                self.works[i].participants.add(user)
+
+    def similarities(self):
+        return set(WorkSimilarity.objects.values_list('work_id', 'similar_work_id', 'score'))
+
+    def test_first_incremental_run_builds_everything_once(self):
+        self.assertEqual(recommendations.build(), (5, 4))
+        self.assertEqual(RecommendationBuild.objects.count(), 1)
+        self.assertEqual(recommendations.build(), (0, 0))
+
+    def test_marker_is_taken_before_reading(self):
+        before = timezone.now()
+        recommendations.build()
+        self.assertGreaterEqual(RecommendationBuild.objects.latest().started_at, before)
+        self.assertLessEqual(RecommendationBuild.objects.latest().started_at, timezone.now())
+
+    def test_incremental_run_matches_a_full_one(self):
+        recommendations.build()
+        self.works[2].participants.add(self.users[3])
+        works, users = recommendations.build()
+        # Work 2 and the works its participants also did; 0 and 4 don't move
+        self.assertEqual(works, 3)
+        incremental = self.similarities()
+        recommendations.build(full=True)
+        self.assertEqual(incremental, self.similarities())
+
+    def test_unrelated_works_are_not_read(self):
+        recommendations.build()
+        self.works[0].participants.add(self.users[1])
+        works, users = recommendations.build()
+        self.assertEqual((works, users), (3, 2))
+
+
+class PasswordHasherTests(TestCase):
+    def test_low_work_factor_never_rehashes_downwards(self):
+        hasher = ConfigurablePBKDF2PasswordHasher()
+        strong = hasher.encode('secret-pass', hasher.salt())
+        with override_settings(PASSWORD_HASH_ITERATIONS=1000):
+            self.assertFalse(hasher.must_update(strong))
+            cheap = hasher.encode('secret-pass', hasher.salt())
+        self.assertTrue(hasher.must_update(cheap))
+
+    def test_user_details_use_the_custom_serializer(self):
+        user = User.objects.create_user('volunteer', password='x')
+        client = APIClient()
+        client.force_authenticate(user)
+        self.assertIn('profile', client.get('/api/auth/user/').data)
+
+
+class StubImageHandler(BaseHTTPRequestHandler):
+    # path -> (status, headers); '/slow' sleeps past the client timeout
+    hosts = []
+    routes = {
+        '/image.png': (200, {'Content-Type': 'image/png'}),
+        '/page': (200, {'Content-Type': 'text/html'}),
+        '/to-image': (302, {'Location': '/image.png'}),
+        '/to-metadata': (302, {'Location': 'http://169.254.169.254/latest/meta-data/'}),
+        '/to-private': (302, {'Location': 'http://10.0.0.1/image.png'}),
+        '/no-head.png': (200, {'Content-Type': 'image/png'}),
+    }
+
+    def respond(self, body):
+        StubImageHandler.hosts.append(self.headers['Host'])
+        if self.path == '/slow':
+            time.sleep(1)
+        if self.path == '/no-head.png' and self.command == 'HEAD':
+            status, headers = 405, {}
+        else:
+            status, headers = self.routes.get(self.path, (404, {}))
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', '4')
+        self.end_headers()
+        if body:
+            self.wfile.write(b'\x89PNG')
+
+    def do_HEAD(self):
+        self.respond(body=False)
+
+    def do_GET(self):
+        self.respond(body=True)
+
+    def log_message(self, *args):
+        pass
+
+
+class ImageLinkProbeTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StubImageHandler)
+        cls.server.daemon_threads = True
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base = f'http://127.0.0.1:{cls.server.server_port}'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        # The stub listens on loopback; every other private range stays refused
+        patcher = mock.patch.object(images, 'is_public', lambda ip: ip.is_global or ip.is_loopback)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def probe(self, path, timeout=2):
+        return probe(self.base + path, timeout)[1:]
+
+    def test_image_and_redirect_to_image(self):
+        self.assertEqual(self.probe('/image.png'), (True, 200))
+        self.assertEqual(self.probe('/to-image'), (True, 200))
+
+    def test_not_an_image(self):
+        self.assertEqual(self.probe('/page'), (False, 200))
+        self.assertEqual(self.probe('/missing.png'), (False, 404))
+
+    def test_head_refused_falls_back_to_get(self):
+        self.assertEqual(self.probe('/no-head.png'), (True, 200))
+
+    def test_redirects_into_private_networks_are_refused(self):
+        self.assertEqual(self.probe('/to-metadata'), (False, None))
+        self.assertEqual(self.probe('/to-private'), (False, None))
+        with self.assertRaises(images.ImageFetchError):
+            images.fetch_image(self.base + '/to-metadata')
+
+    def test_private_host(self):
+        self.assertEqual(probe('http://10.0.0.1/image.png', 2)[1:], (False, None))
+        self.assertEqual(probe('http://[::1]:1/image.png', 2)[1:], (False, None))
+
+    def test_connects_to_the_address_it_checked(self):
+        # DNS rebinding: the name resolves to the stub for the check, then
+        # to a private address for anyone who asks again
+        resolve = socket.getaddrinfo
+        answers = iter(['127.0.0.1'])
+
+        def rebinding(host, *args, **kwargs):
+            if host == 'images.example.org':
+                return resolve(next(answers, '10.0.0.1'), *args, **kwargs)
+            return resolve(host, *args, **kwargs)
+
+        StubImageHandler.hosts.clear()
+        url = f'http://images.example.org:{self.server.server_port}/image.png'
+        with mock.patch('socket.getaddrinfo', rebinding):
+            self.assertEqual(probe(url, 2)[1:], (True, 200))
+        self.assertEqual(StubImageHandler.hosts, [f'images.example.org:{self.server.server_port}'])
+
+    def test_timeout(self):
+        started = time.monotonic()
+        self.assertEqual(self.probe('/slow', timeout=0.2), (False, None))
+        self.assertLess(time.monotonic() - started, 1)
+
+
+class ThumbnailTests(TestCase):
+    def png(self, width, height):
+        from PIL import Image
+
+        out = BytesIO()
+        Image.new('RGB', (width, height)).save(out, 'PNG')
+        return out.getvalue()
+
+    def test_too_many_pixels_is_refused_before_decoding(self):
+        with override_settings(IMAGE_MAX_PIXELS=100):
+            with self.assertRaises(images.ImageFetchError):
+                images.make_thumbnail(self.png(20, 20), 64)
+        self.assertTrue(images.make_thumbnail(self.png(20, 20), 64))
+
+    def test_decompression_bomb_gets_the_fallback(self):
+        from PIL import Image
+
+        work = make_work(User.objects.create_user('organizer'), image_url='https://example.org/bomb.png')
+        with mock.patch.object(images, 'fetch_image', return_value=self.png(40, 40)), \
+                mock.patch.object(Image, 'MAX_IMAGE_PIXELS', 10), \
+                override_settings(IMAGE_CACHE_DIR=tempfile.mkdtemp()):
+            response = self.client.get(f'/api/images/volunteer-work/{work.pk}/')
+        self.assertEqual(response.status_code, 404)
+
+
+class ThumbnailCacheTests(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.cache = images.ThumbnailCache(root=self.root, max_bytes=1000)
+
+    def usage(self):
+        return sum(os.path.getsize(os.path.join(d, n)) for d, _, names in os.walk(self.root) for n in names)
+
+    def test_writes_under_the_cap_do_not_walk_the_directory(self):
+        with mock.patch.object(images.os, 'walk', wraps=os.walk) as walk:
+            for i in range(3):
+                self.cache.put(f'https://example.org/{i}.png', 64, b'x' * 200)
+        self.assertEqual(walk.call_count, 1)
+
+    def test_eviction_keeps_the_cache_under_the_cap(self):
+        for i in range(12):
+            self.cache.put(f'https://example.org/{i}.png', 64, b'x' * 200)
+        self.assertLessEqual(self.usage(), 1000)
+        self.assertIsNotNone(self.cache.get('https://example.org/11.png', 64))
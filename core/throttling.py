@@ -0,0 +1,161 @@
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+from rest_framework.authtoken.models import Token
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+
+class LocalBucketStore:
+    """
+    In-process token buckets. Good enough for a single worker and for tests;
+    the number of tracked clients is capped so scrapers can't grow it forever.
+    """
+
+    def __init__(self, max_keys=10000, **kwargs):
+        self.max_keys = max_keys
+        self.buckets = OrderedDict()
+        self.lock = threading.Lock()
+
+    def consume(self, key, capacity, refill_rate, now):
+        """
+        Take one token from ``key``'s bucket. Returns ``(allowed, remaining,
+        seconds_until_next_token)``.
+        """
+        with self.lock:
+            tokens, last = self.buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - last) * refill_rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self.buckets[key] = (tokens, now)
+            if len(self.buckets) > self.max_keys:
+                self.buckets.popitem(last=False)
+        wait = 0 if tokens >= 1 else (1 - tokens) / refill_rate
+        return allowed, int(tokens), wait
+
+
+class RedisBucketStore:
+    """
+    Token buckets kept in Redis (or anything speaking its protocol, e.g.
+    fakeredis in tests). The refill-and-take step runs as one Lua script, so
+    concurrent workers never race on the same bucket.
+    """
+
+    SCRIPT = """
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local now = tonumber(ARGV[3])
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+    local allowed = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+        allowed = 1
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+    redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+    return {allowed, tostring(tokens)}
+    """
+
+    def __init__(self, url=None, client=None, prefix='ratelimit:', **kwargs):
+        if client is None:
+            import redis
+            client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self.script = client.register_script(self.SCRIPT)
+
+    def consume(self, key, capacity, refill_rate, now):
+        allowed, tokens = self.script(keys=[self.prefix + key], args=[capacity, refill_rate, now])
+        tokens = float(tokens)
+        wait = 0 if tokens >= 1 else (1 - tokens) / refill_rate
+        return bool(allowed), int(tokens), wait
+
+
+_store = None
+
+
+def get_bucket_store():
+    global _store
+    if _store is None:
+        config = dict(getattr(settings, 'RATE_LIMIT_STORE', {}))
+        backend = import_string(config.pop('BACKEND', 'core.throttling.LocalBucketStore'))
+        _store = backend(**{name.lower(): value for name, value in config.items()})
+    return _store
+
+
+def parse_rate(rate):
+    """'60/min' -> (60, 60.0): bucket capacity and the window it refills over."""
+    num, period = rate.split('/')
+    duration = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}[period[0]]
+    return int(num), float(duration)
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Token-bucket throttle keyed on the API token, else the user, else the
+    client IP (as far as NUM_PROXIES lets us trust X-Forwarded-For). Views pick their budget with ``throttle_scope``; rates are
+    looked up in DEFAULT_THROTTLE_RATES as ``<scope>.<anon|user>``, then
+    ``<scope>``, then plain ``anon`` / ``user``.
+    """
+
+    def get_client(self, request):
+        if isinstance(request.auth, Token):
+            return 'user', 'token:' + hashlib.sha1(request.auth.key.encode()).hexdigest()[:16]
+        if request.user and request.user.is_authenticated:
+            return 'user', f'user:{request.user.pk}'
+        return 'anon', 'ip:' + self.get_ident(request)
+
+    def get_rate(self, scope, kind):
+        rates = api_settings.DEFAULT_THROTTLE_RATES
+        for name in (f'{scope}.{kind}', scope, kind):
+            if name and rates.get(name):
+                return rates[name]
+        return None
+
+    def allow_request(self, request, view):
+        scope = getattr(view, 'throttle_scope', None)
+        kind, client = self.get_client(request)
+        rate = self.get_rate(scope, kind)
+        if rate is None:
+            return True
+
+        capacity, duration = parse_rate(rate)
+        allowed, remaining, self.retry_after = get_bucket_store().consume(
+            f'{scope or "default"}:{client}', capacity, capacity / duration, time.time()
+        )
+        # Picked up by RateLimitHeadersMiddleware once the response exists
+        request._request.rate_limit = {
+            'limit': capacity,
+            'remaining': remaining,
+            'reset': math.ceil(duration * (capacity - remaining) / capacity),
+            'window': int(duration),
+        }
+        return allowed
+
+    def wait(self):
+        return self.retry_after
+
+
+class RateLimitHeadersMiddleware:
+    """Adds RateLimit-* headers (IETF draft) to throttled API responses."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        info = getattr(request, 'rate_limit', None)
+        if info is not None:
+            response['RateLimit-Limit'] = str(info['limit'])
+            response['RateLimit-Remaining'] = str(info['remaining'])
+            response['RateLimit-Reset'] = str(info['reset'])
+            response['RateLimit-Policy'] = f"{info['limit']};w={info['window']}"
+        return response
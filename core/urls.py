@@ -1,12 +1,13 @@
-from django.urls import path, include
+from django.urls import path, re_path, include
 from rest_framework.routers import DefaultRouter
-from .views import VolunteerWorkViewSet, ReviewViewSet,UserListView,JoinRequestViewSet,CategoryViewSet,CategoryworklistViewSet,has_reviewed,UserEditView,UserDetailViewById,UserProfileRegisterView
+from .views import VolunteerWorkViewSet, ReviewViewSet,UserListView,JoinRequestViewSet,CategoryViewSet,CategoryworklistViewSet,has_reviewed,UserEditView,UserDetailViewById,UserProfileRegisterView,UserAutocompleteView,ObjectHistoryView,UserActivityView,EventSeriesViewSet,ThumbnailView,SyncView,OrganizerAnalyticsView,UserHoursView,LeaderboardView
 
 router = DefaultRouter()
 router.register('volunteer-work', VolunteerWorkViewSet)
 router.register('reviews', ReviewViewSet)
 router.register('join-requests', JoinRequestViewSet)
 router.register('category-list',CategoryViewSet)
+router.register('series', EventSeriesViewSet)
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -14,9 +15,17 @@ urlpatterns = [
     path('participated/', VolunteerWorkViewSet.as_view({'get': 'participated_works'}), name='participated-volunteer-works'),
     path('<int:pk>/', VolunteerWorkViewSet.as_view({'get': 'details'}), name='volunteer-work-details'),
     path('users/', UserListView.as_view(), name='user-list'),
+    path('users/autocomplete/', UserAutocompleteView.as_view(), name='user-autocomplete'),
     path('users/<int:pk>/', UserDetailViewById.as_view(), name='user-detail'),
     path('auth/user/edit/', UserEditView.as_view(), name='user-edit'),
     path('list/<slug:slug>/',CategoryworklistViewSet.as_view(), name='category-work-list'),
     path('volunteer-work/<int:volunteer_work_id>/has-reviewed/', has_reviewed, name='has-reviewed'),
     path('register/', UserProfileRegisterView.as_view(), name='user-profile-register'),
+    path('audit/<str:object_type>/<int:object_id>/', ObjectHistoryView.as_view(), name='object-history'),
+    path('users/<int:pk>/hours/', UserHoursView.as_view(), name='user-hours'),
+    path('users/<int:pk>/activity/', UserActivityView.as_view(), name='user-activity'),
+    path('sync/', SyncView.as_view(), name='sync'),
+    path('leaderboard/', LeaderboardView.as_view(), name='leaderboard'),
+    path('analytics/', OrganizerAnalyticsView.as_view(), name='organizer-analytics'),
+    re_path(r'^images/(?P<kind>volunteer-work|series|profile)/(?P<pk>\d+)/$', ThumbnailView.as_view(), name='image-thumbnail'),
 ]
@@ -8,21 +8,48 @@ from rest_framework.response import Response
 from .permissions import IsOrganizerOrReadOnly,IsOrganizer
 from dj_rest_auth.registration.views import RegisterView
 from rest_framework.views import APIView
-from .serializers import CustomRegisterSerializer,CustomUserSerializer,UserProfileRegisterSerializer
+from .serializers import CustomRegisterSerializer,CustomUserSerializer,UserProfileRegisterSerializer,UserDirectorySerializer,AuditEventSerializer,EventSeriesSerializer,UserEditSerializer,CheckInBatchSerializer,LeaderboardEntrySerializer
 from django.contrib.auth.models import User
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from datetime import datetime, time, timedelta
+from itertools import islice
+import heapq
+import re
 from rest_framework import generics
 from rest_framework import status
 from django.shortcuts import render,get_object_or_404
 from rest_framework.decorators import api_view
-from rest_framework.exceptions import APIException
-from .models import Profile
+from rest_framework.exceptions import APIException, PermissionDenied
+from .models import Profile, AuditEvent, EventSeries, LeaderboardEntry, VolunteerHours, RATING_COUNT_FIELDS
+from .pagination import StandardPagination, StableOrderingFilter, AuditCursorPagination
+from rest_framework.filters import SearchFilter
+from .idempotency import idempotent
+from .recommendations import recommended_work_ids
+from .images import THUMBNAIL_SIZES, ImageFetchError, ThumbnailCache, get_thumbnail
+from django.http import FileResponse, HttpResponseNotModified
+from .conditional import ConditionalGetMixin, conditional_response, queryset_validators
+from .sync import changes_since
+from .analytics import organizer_report
+from .checkin import make_token, record_scans
+from .hours import GLOBAL_BOARD, category_board
+from django.conf import settings
+
+
+def include_past(request):
+    """True when a listing was asked to read archived rows too (?include_past=true)."""
+    return request.query_params.get('include_past', '').lower() in ('1', 'true', 'yes')
 
 
 class CustomRegisterView(RegisterView):
     serializer_class = CustomRegisterSerializer
 
 class UserProfileRegisterView(APIView):
+    throttle_scope = 'register'
     permission_classes = [AllowAny]
+
+    @idempotent
     def post(self, request, *args, **kwargs):
         serializer = UserProfileRegisterSerializer(data=request.data)
         if serializer.is_valid():
@@ -34,7 +61,8 @@ class UserProfileRegisterView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class VolunteerWorkViewSet(viewsets.ModelViewSet):
+class VolunteerWorkViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
+    throttle_scope = 'volunteer-work'
     queryset = VolunteerWork.objects.all()
     serializer_class = VolunteerWorkSerializer
 
@@ -42,7 +70,7 @@ class VolunteerWorkViewSet(viewsets.ModelViewSet):
         # Apply different permissions for different actions
         if self.action in ['list', 'retrieve','details']:
             permission_classes = [AllowAny]
-        elif self.action in ['my_works', 'participated_works']:
+        elif self.action in ['my_works', 'participated_works', 'recommended', 'checkin_token', 'checkins']:
             permission_classes = [IsAuthenticated]
         elif self.action == 'create':
             permission_classes = [IsAuthenticated]
@@ -50,6 +78,13 @@ class VolunteerWorkViewSet(viewsets.ModelViewSet):
             permission_classes = [IsAuthenticated, IsOrganizerOrReadOnly]
         return [permission() for permission in permission_classes]
 
+    def get_queryset(self):
+        queryset = VolunteerWork.objects.all()
+        # Detail routes can reach archived work; listings stay on the hot set
+        if self.action in ('list', 'my_works', 'participated_works') and not include_past(self.request):
+            queryset = queryset.filter(archived=False)
+        return queryset
+
     def perform_create(self, serializer):
         serializer.save(organizer=self.request.user)
 
@@ -68,30 +103,79 @@ class VolunteerWorkViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def my_works(self, request):
         """List of volunteer work organized by the user."""
-        queryset = VolunteerWork.objects.filter(organizer=request.user)
+        queryset = self.get_queryset().filter(organizer=request.user)
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
     @action(detail=False, methods=['get'])
     def participated_works(self, request):
         """List of volunteer work the user has participated in."""
-        queryset = VolunteerWork.objects.filter(participants=request.user)
+        queryset = self.get_queryset().filter(participants=request.user)
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['get'])
+    def recommended(self, request):
+        """Upcoming volunteer work the user may like, best match first."""
+        ids = recommended_work_ids(request.user)
+        works = VolunteerWork.objects.filter(pk__in=ids, date__gte=timezone.now()).in_bulk()
+        serializer = self.get_serializer([works[pk] for pk in ids if pk in works], many=True)
+        return Response(serializer.data)
+
     @action(detail=True, methods=['get'])
     def details(self, request, pk=None):
         """Details of a specific volunteer work."""
-        instance = self.get_object()
-        serializer = self.get_serializer(instance)
-        return Response(serializer.data)
+        def render():
+            instance = self.get_object()
+            serializer = self.get_serializer(instance)
+            return Response(serializer.data)
+
+        etag_parts, last_modified = queryset_validators(self.get_object_queryset())
+        return conditional_response(request, etag_parts, last_modified, render)
+
+    @action(detail=True, methods=['get'], url_path='checkin-token')
+    def checkin_token(self, request, pk=None):
+        """The signed token a participant shows as a QR code at the door."""
+        work = self.get_object()
+        if not work.participants.filter(pk=request.user.pk).exists():
+            return Response({"detail": "Only participants can check in."}, status=status.HTTP_403_FORBIDDEN)
+        return Response({'token': make_token(work.pk, request.user.pk)})
+
+    @action(detail=True, methods=['post'], throttle_scope='checkin')
+    def checkins(self, request, pk=None):
+        """
+        Buffered scans from the organizer's scanner device. Tokens are
+        verified by signature alone; replays and overlapping batches are
+        absorbed by the upsert, so a device can resend until it sees a 200.
+        """
+        work = self.get_object()
+        if work.organizer != request.user:
+            return Response({"detail": "Only the organizer can record check-ins."}, status=status.HTTP_403_FORBIDDEN)
+        serializer = CheckInBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        accepted, rejected = record_scans(work, serializer.validated_data['scans'], request.user)
+        return Response({
+            'accepted': accepted,
+            'rejected': [{'index': index, 'detail': reason} for index, reason in rejected],
+        })
 
 class UserDetailViewById(generics.RetrieveAPIView):
+    throttle_scope = 'users'
     queryset = User.objects.all()
     serializer_class = CustomUserSerializer
 
     def get(self, request, *args, **kwargs):
         user_id = kwargs.get('pk')  # Get user ID from the URL
+        # User has no updated_at of its own, so the validator is the public
+        # user columns plus the profile timestamp, fetched as a single row.
+        row = User.objects.filter(pk=user_id).values_list(
+            'username', 'email', 'first_name', 'last_name', 'profile__updated_at'
+        ).first()
+        if row is None or row[-1] is None:
+            return self.render_user(user_id)
+        return conditional_response(request, row, row[-1], lambda: self.render_user(user_id))
+
+    def render_user(self, user_id):
         try:
             user = User.objects.get(pk=user_id)
             serializer = self.get_serializer(user)
@@ -100,15 +184,39 @@ class UserDetailViewById(generics.RetrieveAPIView):
             return Response({"detail": "User not found."}, status=status.HTTP_404_NOT_FOUND)
 
 class ReviewViewSet(viewsets.ModelViewSet):
+    throttle_scope = 'reviews'
     queryset = Review.objects.all()
     serializer_class = ReviewSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
 
+    pagination_class = StandardPagination
+    filter_backends = [StableOrderingFilter]
+    # ?ordering=-created_at (newest, default) or ?ordering=-rating, either
+    # direction. Ties fall back to created_at then id in the same direction,
+    # so rating orders read (volunteer_work, rating, created_at, id) and date
+    # orders (volunteer_work, created_at, id) in one index scan
+    ordering_fields = ['created_at', 'rating']
+    ordering = ['-created_at']
+    ordering_tiebreakers = ['created_at', 'pk']
+
     def get_queryset(self):
         volunteer_work_id = self.request.query_params.get('volunteer_work', None)
         if volunteer_work_id is not None:
-            return Review.objects.filter(volunteer_work_id=volunteer_work_id)
-        return Review.objects.all()
+            return Review.objects.filter(volunteer_work_id=volunteer_work_id).select_related('user')
+        return Review.objects.select_related('user')
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        volunteer_work_id = request.query_params.get('volunteer_work', None)
+        if volunteer_work_id is not None and response.status_code == 200:
+            # Read from the counters on VolunteerWork instead of scanning reviews
+            work = VolunteerWork.objects.filter(pk=volunteer_work_id).only(*RATING_COUNT_FIELDS.values()).first()
+            response.data['rating_histogram'] = work.rating_histogram() if work else {}
+        return response
+
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
     
     def perform_create(self, serializer):
         # Ensure the user can't review the same volunteer work more than once
@@ -142,57 +250,112 @@ def has_reviewed(request, volunteer_work_id):
     
 
 
-class UserListView(generics.ListAPIView):
-    queryset = User.objects.all()
-    serializer_class = CustomUserSerializer
-
-class UserEditView(APIView):
-    permission_classes = [IsAuthenticated]
+class UserHoursView(APIView):
+    """
+    A user's volunteer hours in this organisation: the ledger total for
+    completed works, and how many works they were checked in at.
+    """
+    throttle_scope = 'users'
+    permission_classes = [AllowAny]
 
-    def put(self, request, *args, **kwargs):
-        user = request.user
-        data = request.data
+    def get(self, request, pk):
+        user = get_object_or_404(User, pk=pk)
+        total = VolunteerHours.objects.filter(user=user).values_list('hours', flat=True).first()
+        return Response({
+            'user': user.pk,
+            'hours': total or 0,
+            'attended': user.attendances.count(),
+        })
+
+
+class LeaderboardView(generics.ListAPIView):
+    """
+    Top volunteers by hours, read from the precomputed LeaderboardEntry
+    table (see core/hours.py). ?category=<slug> narrows to one category and
+    ?period=YYYY or YYYY-MM to one year or month; the default is all time.
+    """
+    throttle_scope = 'leaderboard'
+    permission_classes = [AllowAny]
+    serializer_class = LeaderboardEntrySerializer
+    pagination_class = StandardPagination
 
-        # Update user fields
-        user.username = data.get('username', user.username)
-        user.email = data.get('email', user.email)
-        user.first_name = data.get('first_name', user.first_name)
-        user.last_name = data.get('last_name', user.last_name)
+    def get_queryset(self):
+        board = GLOBAL_BOARD
+        slug = self.request.query_params.get('category')
+        if slug:
+            board = category_board(get_object_or_404(Category, slug=slug).pk)
+        period = self.request.query_params.get('period', '')
+        if period and not re.fullmatch(r'\d{4}(-(0[1-9]|1[0-2]))?', period):
+            raise serializers.ValidationError({"period": "Use YYYY or YYYY-MM."})
+        return (
+            LeaderboardEntry.objects.filter(board=board, period=period)
+            .select_related('user').order_by('rank', 'user_id')
+        )
 
-        # Save user changes
-        user.save()
 
-        # Update or create profile fields
-        profile, created = Profile.objects.get_or_create(user=user)
+class UserListView(generics.ListAPIView):
+    throttle_scope = 'users'
+    # Prefix search ('^') becomes UPPER(col::text) LIKE 'X%' on Postgres,
+    # which the *_upper_prefix indexes from migration 0015 serve.
+    queryset = User.objects.select_related('profile').order_by('username')
+    serializer_class = UserDirectorySerializer
+    pagination_class = StandardPagination
+    filter_backends = [SearchFilter]
+    search_fields = ['^username', '^first_name', '^last_name']
+
+
+class UserAutocompleteView(APIView):
+    """
+    Compact username/name suggestions for type-ahead inputs. Returns plain
+    tuples from a single indexed query, without going through a serializer.
+    """
+    throttle_scope = 'autocomplete'
+    max_results = 10
 
-        # Update profile fields
-        profile.bio = data.get('bio', profile.bio)
-        profile.contact_info = data.get('contact_info', profile.contact_info)
+    def get(self, request, *args, **kwargs):
+        term = request.query_params.get('q', '').strip()
+        if not term:
+            return Response([])
+        try:
+            limit = min(int(request.query_params.get('limit', self.max_results)), self.max_results)
+        except ValueError:
+            limit = self.max_results
+
+        rows = (
+            User.objects
+            .filter(Q(username__istartswith=term) | Q(first_name__istartswith=term) | Q(last_name__istartswith=term))
+            .order_by('username')
+            .values_list('id', 'username', 'first_name', 'last_name', 'profile__profile_picture')[:max(limit, 1)]
+        )
+        return Response([
+            {'id': pk, 'username': username, 'name': f'{first} {last}'.strip(), 'picture': picture}
+            for pk, username, first, last, picture in rows
+        ])
 
-        # If profile_picture URL is provided, update it
-        profile_picture_url = data.get('profile_picture')
-        if profile_picture_url:
-            profile.profile_picture = profile_picture_url  # Directly set the URL
+class UserEditView(APIView):
+    throttle_scope = 'users'
+    permission_classes = [IsAuthenticated]
 
-        # Save profile changes
-        profile.save()
+    def put(self, request, *args, **kwargs):
+        # PUT has always ignored an empty profile_picture instead of clearing it
+        data = request.data.copy()
+        if not data.get('profile_picture'):
+            data.pop('profile_picture', None)
+        return self.update(request, data)
+
+    def patch(self, request, *args, **kwargs):
+        return self.update(request, request.data)
+
+    def update(self, request, data):
+        user = User.objects.select_related('profile').get(pk=request.user.pk)
+        serializer = UserEditSerializer(user, data=data, partial=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_200_OK)
 
-        # Return success response
-        return Response({
-            'id': user.id,
-            'username': user.username,
-            'email': user.email,
-            'first_name': user.first_name,
-            'last_name': user.last_name,
-            'profile': {
-                'bio': profile.bio,
-                'profile_picture': profile.profile_picture,
-                'contact_info': profile.contact_info,
-            }
-        }, status=status.HTTP_200_OK)
-      
 
 class JoinRequestViewSet(viewsets.ModelViewSet):
+    throttle_scope = 'join-requests'
     queryset = JoinRequest.objects.all()
     serializer_class = JoinRequestSerializer
     permission_classes = [IsAuthenticated, IsOrganizer]
@@ -202,7 +365,14 @@ class JoinRequestViewSet(viewsets.ModelViewSet):
         Optionally restricts the returned join requests to those for the current user's volunteer works.
         """
         user = self.request.user
-        return JoinRequest.objects.filter(volunteer_work__organizer=user)
+        queryset = JoinRequest.objects.filter(volunteer_work__organizer=user)
+        if self.action == 'list' and not include_past(self.request):
+            queryset = queryset.filter(archived=False)
+        return queryset
+
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -211,6 +381,7 @@ class JoinRequestViewSet(viewsets.ModelViewSet):
     def approve(self, request, pk=None):
         join_request = self.get_object()
         join_request.status = 'approved'
+        join_request.decided_at = timezone.now()
         join_request.save()
         join_request.volunteer_work.participants.add(join_request.user)
         return Response({'status': 'approved'})
@@ -219,16 +390,278 @@ class JoinRequestViewSet(viewsets.ModelViewSet):
     def reject(self, request, pk=None):
         join_request = self.get_object()
         join_request.status = 'rejected'
+        join_request.decided_at = timezone.now()
         join_request.save()
         return Response({'status': 'rejected'})
     
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
+    throttle_scope = 'categories'
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
 
+    def get_queryset(self):
+        # The class attribute was built at import, outside any organisation
+        return Category.objects.all()
+
 class CategoryworklistViewSet(APIView):
+    throttle_scope = 'categories'
     def get(self,request,slug=None):
-        category = get_object_or_404(Category,slug=slug)
-        VolunteerWorks = VolunteerWork.objects.filter(category=category)
-        serializer = VolunteerWorkSerializer(VolunteerWorks,many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        def render():
+            category = get_object_or_404(Category,slug=slug)
+            VolunteerWorks = works.filter(category=category)
+            serializer = VolunteerWorkSerializer(VolunteerWorks,many=True)
+            return Response(serializer.data)
+
+        works = VolunteerWork.objects.all()
+        if not include_past(request):
+            works = works.filter(archived=False)
+        etag_parts, last_modified = queryset_validators(works.filter(category__slug=slug))
+        return conditional_response(request, etag_parts, last_modified, render)
+
+
+class ObjectHistoryView(generics.ListAPIView):
+    """
+    Change history of one object, newest first. Organizers may read the
+    history of their own volunteer works; everything else is staff only.
+    """
+    throttle_scope = 'audit'
+    serializer_class = AuditEventSerializer
+    pagination_class = AuditCursorPagination
+
+    def get_queryset(self):
+        object_type, object_id = self.kwargs['object_type'], self.kwargs['object_id']
+        user = self.request.user
+        if not user.is_staff and not (
+            object_type == 'volunteerwork'
+            and VolunteerWork.objects.filter(pk=object_id, organizer=user).exists()
+        ):
+            raise PermissionDenied("You do not have permission to view this history.")
+        return AuditEvent.objects.filter(object_type=object_type, object_id=object_id).select_related('actor')
+
+
+class UserActivityView(generics.ListAPIView):
+    """Changes made by a user, newest first. Users see their own; staff see anyone's."""
+    throttle_scope = 'audit'
+    serializer_class = AuditEventSerializer
+    pagination_class = AuditCursorPagination
+
+    def get_queryset(self):
+        user_id = self.kwargs['pk']
+        if not self.request.user.is_staff and self.request.user.pk != user_id:
+            raise PermissionDenied("You do not have permission to view this activity.")
+        return AuditEvent.objects.filter(actor_id=user_id).select_related('actor')
+
+
+class ThumbnailView(APIView):
+    """
+    WebP thumbnail of a work's image or a user's profile picture, fetched
+    once from the original URL and then served from the disk cache. Only
+    URLs stored on our own rows can be proxied.
+    """
+    permission_classes = [AllowAny]
+    throttle_scope = 'images'
+    max_age = 7 * 24 * 60 * 60
+
+    def get_image_url(self, kind, pk):
+        if kind == 'volunteer-work':
+            queryset = VolunteerWork.objects.filter(pk=pk).values_list('image_url', flat=True)
+        elif kind == 'series':
+            queryset = EventSeries.objects.filter(pk=pk).values_list('image_url', flat=True)
+        else:
+            queryset = Profile.objects.filter(user_id=pk).values_list('profile_picture', flat=True)
+        return queryset.first()
+
+    def get(self, request, kind, pk):
+        try:
+            size = int(request.query_params.get('size', 256))
+        except ValueError:
+            size = None
+        if size not in THUMBNAIL_SIZES:
+            return Response({"detail": f"size must be one of {', '.join(map(str, THUMBNAIL_SIZES))}."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        url = self.get_image_url(kind, pk)
+        if not url:
+            return Response({"detail": "No image."}, status=status.HTTP_404_NOT_FOUND)
+
+        etag = '"%s"' % ThumbnailCache.digest(url, size)
+        if etag in request.headers.get('If-None-Match', ''):
+            response = HttpResponseNotModified()
+        else:
+            try:
+                path = get_thumbnail(url, size)
+            except ImageFetchError as e:
+                return Response({"detail": str(e)}, status=status.HTTP_404_NOT_FOUND)
+            response = FileResponse(open(path, 'rb'), content_type='image/webp')
+        response['ETag'] = etag
+        response['Cache-Control'] = f'public, max-age={self.max_age}'
+        return response
+
+
+def parse_moment(value):
+    """Parse an ISO datetime or date query value into an aware datetime."""
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            return None
+        moment = datetime.combine(day, time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+class EventSeriesViewSet(viewsets.ModelViewSet):
+    """
+    Recurring volunteer events. Occurrences are expanded lazily for a
+    ?start=&end= window; a VolunteerWork row only exists for an occurrence
+    once it has been materialized (to take join requests and participants).
+    """
+    throttle_scope = 'series'
+    queryset = EventSeries.objects.all()
+    serializer_class = EventSeriesSerializer
+    default_window = timedelta(days=90)
+    max_window = timedelta(days=366)
+    max_occurrences = 500
+
+    def get_permissions(self):
+        if self.action in ['list', 'retrieve', 'occurrences', 'window_occurrences']:
+            permission_classes = [AllowAny]
+        elif self.action in ['create', 'materialize']:
+            permission_classes = [IsAuthenticated]
+        else:
+            permission_classes = [IsAuthenticated, IsOrganizerOrReadOnly]
+        return [permission() for permission in permission_classes]
+
+    def get_queryset(self):
+        # The class attribute was built at import, outside any organisation
+        return EventSeries.objects.all()
+
+    def perform_create(self, serializer):
+        serializer.save(organizer=self.request.user)
+
+    def get_window(self):
+        params = self.request.query_params
+        try:
+            start = parse_moment(params['start']) if 'start' in params else timezone.now()
+            end = parse_moment(params['end']) if 'end' in params else start and start + self.default_window
+        except (OverflowError, ValueError):
+            start = end = None
+        if start is None or end is None:
+            raise serializers.ValidationError("start and end must be ISO 8601 dates or datetimes.")
+        if not timedelta(0) < end - start <= self.max_window:
+            raise serializers.ValidationError(f"The window must be positive and at most {self.max_window.days} days.")
+        return start, end
+
+    def expand(self, series_list, start, end):
+        """Merge the occurrence streams of several series in date order, capped."""
+        def stream(series):
+            for occurrence in series.occurrences(after=start, before=end):
+                yield occurrence, series
+
+        merged = heapq.merge(*[stream(series) for series in series_list], key=lambda item: item[0])
+        pairs = list(islice(merged, self.max_occurrences))
+
+        materialized = dict(
+            ((series_id, date), pk) for pk, series_id, date in VolunteerWork.objects.filter(
+                series__in=series_list, date__gte=start, date__lt=end,
+            ).values_list('pk', 'series_id', 'date')
+        )
+        return Response([
+            {
+                'series': series.pk,
+                'title': series.title,
+                'location': series.location,
+                'category': series.category_id,
+                'date': occurrence,
+                'volunteer_work': materialized.get((series.pk, occurrence)),
+            }
+            for occurrence, series in pairs
+        ])
+
+    @action(detail=False, methods=['get'], url_path='occurrences', url_name='window-occurrences')
+    def window_occurrences(self, request):
+        """Occurrences of every series inside the window, in date order."""
+        start, end = self.get_window()
+        series_list = EventSeries.objects.filter(start__lt=end).filter(Q(ends_at__isnull=True) | Q(ends_at__gte=start))
+        return self.expand(list(series_list), start, end)
+
+    @action(detail=True, methods=['get'])
+    def occurrences(self, request, pk=None):
+        """Occurrences of one series inside the window."""
+        start, end = self.get_window()
+        return self.expand([self.get_object()], start, end)
+
+    @action(detail=True, methods=['post'])
+    def materialize(self, request, pk=None):
+        """Create (or fetch) the VolunteerWork for one occurrence so people can join it."""
+        series = self.get_object()
+        try:
+            date = parse_moment(str(request.data.get('date', '')))
+            found = date is not None and next(series.occurrences(after=date, before=date + timedelta(microseconds=1)), None)
+        except (OverflowError, ValueError):
+            found = None
+        if not found:
+            return Response({"detail": "date is not an occurrence of this series."}, status=status.HTTP_400_BAD_REQUEST)
+
+        work, created = VolunteerWork.objects.get_or_create(
+            series=series, date=date,
+            defaults={
+                'title': series.title,
+                'description': series.description,
+                'image_url': series.image_url,
+                'location': series.location,
+                'organizer': series.organizer,
+                'category': series.category,
+            },
+        )
+        serializer = VolunteerWorkSerializer(work)
+        return Response(serializer.data, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
+
+class SyncView(APIView):
+    """
+    Delta sync for offline clients: ``GET /api/sync/?since=<next>`` returns
+    the works, categories, reviews and own join requests created or changed
+    since that token, plus the ids of deleted ones. Omit ``since`` for a full
+    download; keep calling with the returned ``next`` while ``has_more``.
+    """
+    throttle_scope = 'sync'
+    permission_classes = [IsAuthenticated]
+
+    def synced_types(self):
+        return {
+            'volunteerwork': (VolunteerWork.objects.select_related('organizer').prefetch_related('participants'), VolunteerWorkSerializer),
+            'category': (Category.objects.all(), CategorySerializer),
+            'review': (Review.objects.select_related('user'), ReviewSerializer),
+            'joinrequest': (JoinRequest.objects.select_related('user', 'volunteer_work'), JoinRequestSerializer),
+        }
+
+    def get(self, request):
+        try:
+            since = int(request.query_params.get('since') or 0)
+        except ValueError:
+            return Response({"detail": "since must be the next token of an earlier sync."}, status=status.HTTP_400_BAD_REQUEST)
+
+        entries, has_more = changes_since(request.organisation_id, request.user, since, settings.SYNC_BATCH_SIZE)
+        payload = {'next': str(entries[-1].seq if entries else since), 'has_more': has_more}
+        for object_type, (queryset, serializer_class) in self.synced_types().items():
+            changed = [e.object_id for e in entries if e.object_type == object_type and not e.deleted]
+            deleted = [e.object_id for e in entries if e.object_type == object_type and e.deleted]
+            if not changed and not deleted:
+                continue
+            rows = serializer_class(queryset.filter(pk__in=changed), many=True).data if changed else []
+            payload[object_type] = {'changed': rows, 'deleted': deleted}
+        return Response(payload)
+
+
+class OrganizerAnalyticsView(APIView):
+    """
+    Stats over the volunteer work the current user organizes for this
+    organisation: join request funnel and approval latency, participants and
+    how many come back, and ratings, as totals, per month and per event.
+    """
+    throttle_scope = 'analytics'
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        return Response(organizer_report(request.user.pk, request.organisation_id))